@@ -0,0 +1,405 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+import os
+import sys
+import json
+import random
+import argparse
+import platform
+import statistics
+
+from time import perf_counter
+
+# the 'bpy'/'mathutils' stand-ins, then the examples (repository root)
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, os.path.join(BENCH_DIR, "standin"))
+
+import bpy  # noqa: E402
+
+from enum_utils import uid_new  # noqa: E402
+
+
+# HEADLESS BENCHMARKS FOR THE EXAMPLES. RUN WITH PLAIN PYTHON (NUMPY NEEDED):
+#
+#   python bench/run.py [--sizes 10 100 1000 10000] [--out results.json]
+#                       [--baseline old.json]
+#
+# 'bpy' and 'mathutils' are the stand-ins in 'bench/standin': they follow the
+# behaviour the scripts rely on (property callbacks, collections, foreach_get/
+# foreach_set, object transforms, handlers, operators, Blender's quaternion
+# math), not Blender's speed. Every RNA access is plain Python here, so the
+# numbers are for comparing revisions of the scripts on one machine, not a
+# prediction of the timings inside Blender ('enum_ex3b_bench.py' is that).
+#
+# 'ex3b.clear' times the demo's Clear on n items with their objects.
+# 'ex3b.kernel_evaluate' is the NUMPY engine's math without any RNA access
+# (enum_ex3b_kernel.py), so it times the same here as in Blender.
+#
+# For every tree shape, 'ex3b' also checks that both engines give the same
+# loc/rot/ploc/prot (within ENGINE_TOL) for a full evaluation and a subtree
+# edit: deep trees run the kernel's pointer jumping, shallow ones its level
+# batches. A mismatch stops the run with an AssertionError.
+#
+# One JSON line per result is printed:
+#   {"bench": "ex3b.scene_update", "n": 1000, "shape": "random", ...,
+#    "ms": median, "min": fastest, "repeat": runs}
+# '--out' also writes all of them (with the run's metadata) to a file, which a
+# later run can use as '--baseline': results whose fastest run is slower than
+# '--tolerance' times the baseline's are reported as regressions, and the exit
+# status is 1.
+
+SIZES = (10, 100, 1000, 10000)
+SHAPES = ("random", "chain", "star", "bushy")
+REPEAT = 5
+ENGINE_TOL = 1e-4
+
+
+def timed(func, repeat, setup=None):
+    # call from: all benchmarks
+    # (median, min) time in ms
+
+    res = []
+    for k in range(repeat):
+        if setup:
+            setup(k)
+        t = perf_counter()
+        func()
+        res.append((perf_counter() - t) * 1000)
+    return statistics.median(res), min(res)
+
+
+# ------------------------------------------------------------------------------
+#
+# -------------------------------- TREES ---------------------------------------
+
+
+def tree_parents(shape, n, rnd):
+    # call from: 'tree_build'
+    # parent index of each item (-1: root), parents always come first
+
+    if shape == "chain":
+        return [i - 1 for i in range(n)]
+    if shape == "star":
+        return [-1] + [0] * (n - 1)
+    if shape == "bushy":
+        # complete 4-ary tree
+        return [(i - 1) // 4 for i in range(n)]
+    # random: every item gets an earlier item as parent, 1 in 10 is a root
+    return [rnd.randrange(i) if i and rnd.random() < 0.9 else -1 for i in range(n)]
+
+
+def tree_build(props, shape, n, rnd, item_new=None):
+    # call from: 'bench_ex3', 'bench_ex3b'
+    # fill 'props.subs' with 'n' items linked as 'shape'
+
+    subs = props.subs
+    subs.clear()
+    props["subs_idx"] = -1
+    for i in range(n):
+        item = subs.add()
+        item.name = f"sub{i}"
+        item.uid = uid_new(props)
+        if item_new:
+            item_new(item)
+    for i, p in enumerate(tree_parents(shape, n, rnd)):
+        if p > -1:
+            subs[i].pid = subs[p].uid
+    props.cache_reset()
+
+
+def scene_new():
+    # call from: 'main'
+    # an empty file with the objects 'enum_ex3b_setup.py' makes
+
+    scene = bpy.reset()
+    coll = bpy.data.collections.new("base_objects")
+    scene.collection.children.link(coll)
+    for name in ("pob", "vob"):
+        ob = bpy.data.objects.new(name, bpy.data.meshes.new(name))
+        coll.objects.link(ob)
+    return scene
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------ BENCHMARKS ------------------------------------
+
+
+def bench_ex1(scene, n, args, rnd):
+    # up_items: 'n' calls, for random track values
+
+    import enum_ex1 as ex1
+
+    props = scene.denum_tu
+    context = bpy.context
+    tracks = [rnd.randrange(len(ex1.AXES)) for i in range(n)]
+
+    def run():
+        for t in tracks:
+            props["track"] = t
+            ex1.DENUMSYNC_props.up_items(props, context)
+
+    yield {"bench": "ex1.up_items", "shape": "-"}, timed(run, args.repeat)
+
+
+def bench_ex2(scene, n, args, rnd):
+    # optenum_items for 'n' options: first call (cache cleared), then cached
+
+    import enum_ex2 as ex2
+
+    props = scene.denum_opt
+    props["ctrl"] = min(n, len(ex2.NAMES))
+    items = ex2.DENUMCTRL_props.optenum_items
+    context = bpy.context
+
+    def clear(k):
+        items.cache_clear()
+
+    def run():
+        return items(props, context)
+
+    yield {"bench": "ex2.optenum_items", "shape": "-", "cache": "cold"}, timed(
+        run, args.repeat, clear
+    )
+    yield {"bench": "ex2.optenum_items", "shape": "-", "cache": "warm"}, timed(
+        run, args.repeat
+    )
+
+
+def bench_tree(props, items_func, n, shape, args, rnd):
+    # call from: 'bench_ex3', 'bench_ex3b'
+    # descendants and parent_enum_items of a random item
+
+    context = bpy.context
+
+    def pick(k):
+        props["subs_idx"] = rnd.randrange(n)
+
+    def pick_clear(k):
+        pick(k)
+        items_func.cache_clear()
+
+    yield {"bench": "descendants", "shape": shape}, timed(
+        lambda: props.descendants(props.subs_idx), args.repeat, pick
+    )
+    yield {"bench": "parent_enum_items", "shape": shape}, timed(
+        lambda: items_func(props, context), args.repeat, pick_clear
+    )
+
+
+def bench_ex3(scene, n, args, rnd):
+    import enum_ex3 as ex3
+
+    props = scene.denumul_props
+    for shape in args.shapes:
+        tree_build(props, shape, n, rnd)
+        items_func = ex3.DENUMUL_props.parent_enum_items
+        for res, t in bench_tree(props, items_func, n, shape, args, rnd):
+            res["bench"] = "ex3." + res["bench"]
+            yield res, t
+    props.subs.clear()
+    props.cache_reset()
+
+
+def engines_check(scene, shape, rnd):
+    # call from: 'bench_ex3b'
+
+    # largest difference between the NUMPY and MATHUTILS results for a full
+    # evaluation and a subtree edit, with random angles and pivots
+    import enum_ex3b as ex3b
+
+    props = scene.ptdobrels_props
+    subs = props.subs
+    n = len(subs)
+    subs.foreach_set("rotang", [rnd.uniform(-1, 1) for i in range(n * 3)])
+    for item in subs:
+        item.rotpiv = rnd.choice(("parent", "object"))
+    idx = n // 3
+    edit = subs[idx].rotang[:]
+    fields = (("loc", 3), ("rot", 4), ("ploc", 3), ("prot", 4))
+    out = {}
+    for engine in ("MATHUTILS", "NUMPY"):
+        props.engine = engine
+        subs[idx].rotang = edit
+        ex3b.params_reset(props)
+        ex3b.scene_update(scene)
+        full = [ex3b.subs_get(subs, attr, size) for attr, size in fields]
+        subs[idx].rotang = (0.3, -0.2, 0.1)
+        ex3b.params_reset(props)
+        ex3b.scene_update(scene, idx)
+        part = [ex3b.subs_get(subs, attr, size) for attr, size in fields]
+        out[engine] = full + part
+    diff = max(
+        float(abs(a - b).max())
+        for a, b in zip(out["MATHUTILS"], out["NUMPY"])
+        if len(a)
+    )
+    if diff > ENGINE_TOL:
+        raise AssertionError(f"ex3b engines differ by {diff} ({shape}, n={n})")
+    return diff
+
+
+def bench_ex3b(scene, n, args, rnd):
+    import enum_ex3b as ex3b
+
+    props = scene.ptdobrels_props
+    props.subs_max = max(props.subs_max, n)
+    props.frame_cache_mb = 0
+
+    def item_new(item):
+        ex3b.vec_ob_new(scene, item, ex3b.pnt_ob_new(scene, item).name)
+        item.iloc = [rnd.uniform(-1, 1) for i in range(3)]
+        item.rotinf = rnd.random() < 0.7
+
+    def clear():
+        # the demo's Clear: removes the items and their objects
+        if props.subs:
+            bpy.ops.ptdobrels.sub_remove(doall=True)
+
+    frames = iter(range(1, 1 << 30))
+    for shape in args.shapes:
+        clear()
+        tree_build(props, shape, n, rnd, item_new)
+        items_func = ex3b.PTDOBRELS_props.parent_enum_items
+        for res, t in bench_tree(props, items_func, n, shape, args, rnd):
+            res["bench"] = "ex3b." + res["bench"]
+            yield res, t
+        # the batch math alone, on the kernel arrays (no RNA)
+        nodes = ex3b.nodes_pull(props, ex3b.cache_get(props))
+        yield {"bench": "ex3b.kernel_evaluate", "shape": shape}, timed(
+            nodes.evaluate, args.repeat
+        )
+        for engine in args.engines:
+            props.engine = engine
+            # full evaluation, then one animated frame (no frame cache)
+            res = {"bench": "ex3b.scene_update", "shape": shape, "engine": engine}
+            yield res, timed(lambda: ex3b.scene_update(scene), args.repeat)
+            res = {**res, "bench": "ex3b.scene_update_frames"}
+            yield res, timed(
+                lambda: ex3b.scene_update_frames(scene, next(frames) * 0.1),
+                args.repeat,
+            )
+        engines_check(scene, shape, rnd)
+    # Clear: all items, their objects and orphaned meshes (rebuilt before
+    # each run, so at most 3 runs). 'walks' counts the ID user walks of the
+    # last run: one per 'objects.remove' call, one per 'batch_remove'
+    walks = []
+
+    def rebuild(k):
+        clear()
+        tree_build(props, "random", n, rnd, item_new)
+        walks.append(bpy.data.remove_walks)
+
+    res = {"bench": "ex3b.clear", "shape": "-", "repeat": min(args.repeat, 3)}
+    t = timed(clear, res["repeat"], rebuild)
+    res["walks"] = bpy.data.remove_walks - walks[-1]
+    yield res, t
+
+
+BENCHES = {"ex1": bench_ex1, "ex2": bench_ex2, "ex3": bench_ex3, "ex3b": bench_ex3b}
+
+
+# ------------------------------------------------------------------------------
+#
+# -------------------------------- RUNNER --------------------------------------
+
+
+def result_key(res):
+    return tuple(res.get(k) for k in ("bench", "n", "shape", "engine", "cache"))
+
+
+def baseline_check(results, path, tolerance):
+    # call from: 'main'
+    # list of results slower than 'tolerance' times their baseline
+
+    with open(path) as f:
+        old = {result_key(res): res for res in json.load(f)["results"]}
+    slow = []
+    for res in results:
+        base = old.get(result_key(res))
+        if base is None or base["min"] <= 0:
+            continue
+        # the fastest runs are compared: the medians are noisier
+        res["ratio"] = round(res["min"] / base["min"], 3)
+        # ignore sub-0.05 ms noise
+        if res["ratio"] > tolerance and res["min"] - base["min"] > 0.05:
+            slow.append(res)
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="headless enum example benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=SHAPES)
+    parser.add_argument("--benches", nargs="+", choices=BENCHES, default=BENCHES)
+    parser.add_argument(
+        "--engines", nargs="+", choices=("NUMPY", "MATHUTILS"), default=("NUMPY",)
+    )
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write all results to this JSON file")
+    parser.add_argument("--baseline", help="compare with a previous '--out' file")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    import numpy
+
+    meta = {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+    scene = scene_new()
+    modules = {}
+    for name in args.benches:
+        modules[name] = __import__(f"enum_{name}")
+        modules[name].register()
+    results = []
+    try:
+        for name in args.benches:
+            for n in args.sizes:
+                rnd = random.Random(args.seed)
+                for res, (ms, fastest) in BENCHES[name](scene, n, args, rnd):
+                    res.update(n=n, ms=round(ms, 4), min=round(fastest, 4))
+                    res.setdefault("repeat", args.repeat)
+                    print(json.dumps(res), flush=True)
+                    results.append(res)
+    finally:
+        for mod in modules.values():
+            mod.unregister()
+    slow = []
+    if args.baseline:
+        slow = baseline_check(results, args.baseline, args.tolerance)
+        for res in slow:
+            print(json.dumps({"regression": res}))
+        print(f"baseline: {len(slow)} regressions (tolerance {args.tolerance}x)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1)
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+# Headless stand-in for the parts of Blender's 'bpy' module used by the
+# examples in this repository. It reproduces the semantics the scripts rely on
+# (property descriptors, update/get/set callbacks, collections with
+# foreach_get/foreach_set, object transforms, handlers and operator calls), not
+# Blender's performance characteristics: every RNA access here is plain Python.
+
+
+import os
+import sys
+
+from . import app, props, types, utils  # noqa: F401
+
+
+# ---- bpy.data
+
+
+class _IDCollection:
+    def __init__(self, cls):
+        self._cls = cls
+        self._ids = {}
+        # next free numeric suffix per base name
+        self._next = {}
+
+    def _unique(self, name):
+        if name not in self._ids:
+            return name
+        base = name.rsplit(".", 1)[0] if name[-4:-3] == "." else name
+        i = self._next.get(base, 1)
+        while f"{base}.{i:03d}" in self._ids:
+            i += 1
+        self._next[base] = i + 1
+        return f"{base}.{i:03d}"
+
+    def new(self, name, *args):
+        idb = self._cls(self._unique(name), *args)
+        idb._store = self
+        self._ids[idb.name] = idb
+        return idb
+
+    def _rename(self, idb, name):
+        if name == idb.name:
+            return
+        del self._ids[idb.name]
+        idb._name = self._unique(name)
+        self._ids[idb.name] = idb
+
+    def remove(self, idb, do_unlink=True):
+        if self._ids.get(idb.name) is not idb:
+            raise ReferenceError(f"'{idb.name}' not in collection")
+        data._unlink(idb)
+        del self._ids[idb.name]
+        idb._store = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(list(self._ids.values()))
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __getitem__(self, name):
+        return self._ids[name]
+
+    def get(self, name, default=None):
+        return self._ids.get(name, default)
+
+
+class _Data:
+    def __init__(self):
+        self.filepath = ""
+        self.objects = _IDCollection(types.Object)
+        self.meshes = _IDCollection(types.Mesh)
+        self.collections = _IDCollection(types.Collection)
+        self.node_groups = _IDCollection(types.NodeTree)
+        self.materials = _IDCollection(types.Material)
+        self.scenes = _IDCollection(types.Scene)
+        # number of ID user-walks done by removals (each walks all IDs)
+        self.remove_walks = 0
+
+    def _unlink(self, idb):
+        self.remove_walks += 1
+        if isinstance(idb, types.Object):
+            for coll in list(idb.users_collection):
+                coll.unlink(idb)
+            if idb.data is not None:
+                idb.data.users -= 1
+
+    def batch_remove(self, ids):
+        # one user-walk for the whole batch
+        walks = self.remove_walks + 1
+        for idb in ids:
+            if idb._store is not None:
+                idb._store.remove(idb)
+        self.remove_walks = walks
+
+    def orphans_purge(self):
+        pass
+
+
+data = _Data()
+
+
+# ---- bpy.context
+
+
+class _Screen:
+    is_animation_playing = False
+
+
+class _Context:
+    def __init__(self):
+        self.scene = None
+        self.screen = _Screen()
+        self.window_manager = types.WindowManager("WinMan")
+        self.area = None
+        self.region = None
+
+
+context = _Context()
+
+
+def reset():
+    """Start from an empty file with one scene (benchmark helper)."""
+
+    global data
+    data = _Data()
+    context.scene = data.scenes.new("Scene")
+    context.screen = _Screen()
+    for handlers in app.handlers._all():
+        del handlers[:]
+    return context.scene
+
+
+# ---- bpy.ops
+
+
+class _OpNamespace:
+    def __init__(self, ns):
+        self._ns = ns
+
+    def __getattr__(self, name):
+        idname = f"{self._ns}.{name}"
+        cls = utils._operators.get(idname)
+        if cls is None:
+            raise AttributeError(f"operator 'bpy.ops.{idname}' not registered")
+
+        def call(*args, **kw):
+            op = cls()
+            for key, val in kw.items():
+                setattr(op, key, val)
+            if hasattr(cls, "poll") and not cls.poll(context):
+                raise RuntimeError(f"Operator bpy.ops.{idname}.poll() failed")
+            if args and args[0] == "INVOKE_DEFAULT" and hasattr(op, "invoke"):
+                return op.invoke(context, None)
+            return op.execute(context)
+
+        return call
+
+
+class _Ops:
+    def __getattr__(self, ns):
+        return _OpNamespace(ns)
+
+
+ops = _Ops()
+
+
+# ---- bpy.path
+
+
+class _Path:
+    @staticmethod
+    def abspath(path):
+        if path.startswith("//"):
+            base = os.path.dirname(data.filepath)
+            return os.path.join(base, path[2:])
+        return path
+
+    @staticmethod
+    def basename(path):
+        return os.path.basename(path[2:] if path.startswith("//") else path)
+
+    @staticmethod
+    def clean_name(name, replace="_"):
+        return "".join(c if c.isalnum() or c in "-." else replace for c in name)
+
+    @staticmethod
+    def display_name_from_filepath(path):
+        return os.path.splitext(os.path.basename(path))[0]
+
+
+path = _Path()
+sys.modules[__name__ + ".path"] = path
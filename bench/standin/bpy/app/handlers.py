@@ -0,0 +1,46 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+# Application handler lists and the 'persistent' decorator.
+
+
+frame_change_pre = []
+frame_change_post = []
+depsgraph_update_post = []
+undo_post = []
+redo_post = []
+load_post = []
+
+
+def persistent(func):
+    func._bpy_persistent = True
+    return func
+
+
+def _all():
+    return (
+        frame_change_pre,
+        frame_change_post,
+        depsgraph_update_post,
+        undo_post,
+        redo_post,
+        load_post,
+    )
@@ -0,0 +1,389 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+# Property definitions. Each function returns a descriptor that
+# 'bpy.utils.register_class' binds to the annotated attribute name.
+
+
+from array import array
+
+import mathutils
+
+
+_MISSING = object()
+
+
+class _Prop:
+    def __init__(self, **kw):
+        self.kw = kw
+        self.name = None
+        self.update = kw.get("update")
+        self.fget = kw.get("get")
+        self.fset = kw.get("set")
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        if self.fget is not None:
+            return self.fget(obj)
+        return self.read(obj)
+
+    def __set__(self, obj, value):
+        value = self.convert(obj, value)
+        if self.fset is not None:
+            self.fset(obj, value)
+        else:
+            obj._props[self.name] = value
+        self.updated(obj)
+
+    def updated(self, obj):
+        if self.update is not None:
+            import bpy
+
+            self.update(obj, bpy.context)
+
+    def read(self, obj):
+        val = obj._props.get(self.name, _MISSING)
+        return self.kw.get("default", self.zero) if val is _MISSING else val
+
+    def convert(self, obj, value):
+        return value
+
+    # raw element access for 'foreach_get'/'foreach_set'
+    raw_size = 1
+
+    def raw_get(self, obj):
+        return [self.read(obj)]
+
+    def raw_set(self, obj, vals):
+        obj._props[self.name] = self.convert(obj, vals[0])
+
+
+class _Bool(_Prop):
+    zero = False
+
+    def convert(self, obj, value):
+        return bool(value)
+
+
+class _Int(_Prop):
+    zero = 0
+
+    def convert(self, obj, value):
+        value = int(value)
+        lo, hi = self.kw.get("min"), self.kw.get("max")
+        if lo is not None:
+            value = max(lo, value)
+        if hi is not None:
+            value = min(hi, value)
+        return value
+
+
+class _Float(_Prop):
+    zero = 0.0
+
+    def convert(self, obj, value):
+        value = array("f", (float(value),))[0]
+        lo, hi = self.kw.get("min"), self.kw.get("max")
+        if lo is not None:
+            value = max(lo, value)
+        if hi is not None:
+            value = min(hi, value)
+        return value
+
+
+class _String(_Prop):
+    zero = ""
+
+    def convert(self, obj, value):
+        if not isinstance(value, str):
+            raise TypeError(f"{self.name}: expected a string")
+        return value
+
+    def raw_get(self, obj):
+        raise TypeError(f"foreach_get: '{self.name}' is not a numeric property")
+
+    raw_set = raw_get
+
+
+_MATH_TYPES = {
+    "TRANSLATION": mathutils.Vector,
+    "XYZ": mathutils.Vector,
+    "DIRECTION": mathutils.Vector,
+    "EULER": mathutils.Euler,
+    "QUATERNION": mathutils.Quaternion,
+}
+
+
+class _FloatVector(_Prop):
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self.raw_size = kw.get("size", 3)
+        self.zero = [0.0] * self.raw_size
+
+    def values(self, obj):
+        vals = obj._props.get(self.name)
+        if vals is None:
+            vals = obj._props[self.name] = array("f", self.kw.get("default", self.zero))
+        return vals
+
+    def read(self, obj):
+        vals = self.values(obj)
+
+        def owner(new, obj=obj):
+            self.__set__(obj, new)
+
+        cls = _MATH_TYPES.get(self.kw.get("subtype", "NONE"))
+        if cls is not None and (cls is not mathutils.Euler or self.raw_size == 3):
+            return cls(list(vals), owner=owner)
+        return _PropArray(vals, owner)
+
+    def convert(self, obj, value):
+        vals = array("f", (float(x) for x in value))
+        if len(vals) != self.raw_size:
+            raise ValueError(f"{self.name}: expected {self.raw_size} values")
+        return vals
+
+    def raw_get(self, obj):
+        return list(self.values(obj))
+
+    def raw_set(self, obj, vals):
+        obj._props[self.name] = self.convert(obj, vals)
+
+
+class _PropArray:
+    # bpy_prop_array stand-in: write-through float sequence
+
+    def __init__(self, vals, owner):
+        self._v = list(vals)
+        self._owner = owner
+
+    def __len__(self):
+        return len(self._v)
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def __getitem__(self, i):
+        return self._v[i]
+
+    def __setitem__(self, i, val):
+        self._v[i] = val
+        self._owner(self._v)
+
+
+class _Enum(_Prop):
+    zero = 0
+
+    def items(self, obj):
+        import bpy
+
+        items = self.kw["items"]
+        if callable(items):
+            items = items(obj, bpy.context)
+        return items
+
+    @staticmethod
+    def number(item, i):
+        return item[-1] if len(item) >= 4 else i
+
+    def index(self, obj):
+        if self.fget is not None:
+            return self.fget(obj)
+        val = obj._props.get(self.name, _MISSING)
+        if val is not _MISSING:
+            return val
+        default = self.kw.get("default")
+        if isinstance(default, str):
+            for i, item in enumerate(self.items(obj)):
+                if item[0] == default:
+                    return self.number(item, i)
+        return default or 0
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        n = self.index(obj)
+        for i, item in enumerate(self.items(obj)):
+            if self.number(item, i) == n:
+                return item[0]
+        return ""
+
+    def convert(self, obj, value):
+        if isinstance(value, int):
+            return value
+        for i, item in enumerate(self.items(obj)):
+            if item[0] == value:
+                return self.number(item, i)
+        raise TypeError(f"enum '{value}' not found in '{self.name}'")
+
+    def raw_get(self, obj):
+        raise TypeError(f"foreach_get: '{self.name}' is an enum property")
+
+    raw_set = raw_get
+
+
+class _Pointer(_Prop):
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        from bpy.types import PropertyGroup
+
+        ptype = self.kw["type"]
+        val = obj._props.get(self.name)
+        if getattr(val, "_store", True) is None:
+            # removed ID
+            val = obj._props[self.name] = None
+        if val is None and issubclass(ptype, PropertyGroup):
+            val = obj._props[self.name] = ptype()
+            val._id_data = obj.id_data
+        return val
+
+    def raw_get(self, obj):
+        raise TypeError(f"foreach_get: '{self.name}' is a pointer property")
+
+    raw_set = raw_get
+
+
+class _Collection(_Prop):
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        val = obj._props.get(self.name)
+        if val is None:
+            val = obj._props[self.name] = PropCollection(self.kw["type"], obj)
+        return val
+
+    def __set__(self, obj, value):
+        raise AttributeError(f"'{self.name}' is read-only")
+
+
+class PropCollection:
+    # bpy_prop_collection of PropertyGroup items
+
+    def __init__(self, ptype, owner):
+        self._type = ptype
+        self._owner = owner
+        self._items = []
+
+    def add(self):
+        item = self._type()
+        item._id_data = self._owner.id_data
+        self._items.append(item)
+        return item
+
+    def remove(self, i):
+        del self._items[i]
+
+    def clear(self):
+        self._items.clear()
+
+    def move(self, src, dst):
+        self._items.insert(dst, self._items.pop(src))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for item in self._items:
+                if item.name == key:
+                    return item
+            raise KeyError(key)
+        return self._items[key]
+
+    def find(self, name):
+        for i, item in enumerate(self._items):
+            if item.name == name:
+                return i
+        return -1
+
+    def _prop(self, attr):
+        prop = getattr(self._type, attr, None)
+        if not isinstance(prop, _Prop):
+            raise AttributeError(f"foreach: unknown property '{attr}'")
+        return prop
+
+    def foreach_get(self, attr, seq):
+        prop = self._prop(attr)
+        size = prop.raw_size
+        if len(seq) != size * len(self._items):
+            raise RuntimeError(f"foreach_get('{attr}'): sequence size mismatch")
+        # buffers: numpy arrays, 'array.array' (typed) or lists
+        typed = array if isinstance(seq, array) else None
+        for i, item in enumerate(self._items):
+            vals = prop.raw_get(item)
+            if typed:
+                vals = array(seq.typecode, vals)
+            seq[i * size : (i + 1) * size] = vals
+
+    def foreach_set(self, attr, seq):
+        prop = self._prop(attr)
+        size = prop.raw_size
+        if len(seq) != size * len(self._items):
+            raise RuntimeError(f"foreach_set('{attr}'): sequence size mismatch")
+        for i, item in enumerate(self._items):
+            prop.raw_set(item, [seq[k] for k in range(i * size, (i + 1) * size)])
+
+
+def BoolProperty(**kw):
+    return _Bool(**kw)
+
+
+def IntProperty(**kw):
+    return _Int(**kw)
+
+
+def FloatProperty(**kw):
+    return _Float(**kw)
+
+
+def StringProperty(**kw):
+    return _String(**kw)
+
+
+def FloatVectorProperty(**kw):
+    return _FloatVector(**kw)
+
+
+def IntVectorProperty(**kw):
+    return _FloatVector(**kw)
+
+
+def EnumProperty(**kw):
+    return _Enum(**kw)
+
+
+def PointerProperty(**kw):
+    return _Pointer(**kw)
+
+
+def CollectionProperty(**kw):
+    return _Collection(**kw)
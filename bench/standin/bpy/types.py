@@ -0,0 +1,591 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+# RNA struct stand-ins: PropertyGroup, Operator, Panel, UIList and the ID
+# types (Scene, Object, Mesh, Collection, NodeTree, Material) the examples use.
+
+
+from array import array
+
+import mathutils
+
+from . import props as _props
+
+
+class _StructMeta(type):
+    def __setattr__(cls, name, value):
+        # 'bpy.types.Scene.my_props = PointerProperty(...)'
+        if isinstance(value, _props._Prop):
+            value.__set_name__(cls, name)
+        super().__setattr__(name, value)
+
+
+class bpy_struct(metaclass=_StructMeta):
+    def __init__(self):
+        self._props = {}
+        self._id_data = None
+
+    @property
+    def id_data(self):
+        return self._id_data if self._id_data is not None else self
+
+    def as_pointer(self):
+        return id(self)
+
+    def get(self, key, default=None):
+        val = self._props.get(key, default)
+        if isinstance(val, array):
+            return list(val)
+        return val
+
+    def __getitem__(self, key):
+        return self._props[key]
+
+    def __setitem__(self, key, value):
+        self._props[key] = value
+
+    def __delitem__(self, key):
+        del self._props[key]
+
+    def __contains__(self, key):
+        return key in self._props
+
+    def keys(self):
+        return self._props.keys()
+
+    def bl_rna_properties(self):
+        return [
+            k
+            for k, v in vars(type(self)).items()
+            if isinstance(v, _props._Prop)
+        ]
+
+
+class PropertyGroup(bpy_struct):
+    pass
+
+
+class _Layout:
+    # UILayout stand-in: records nothing, accepts everything
+
+    def __init__(self):
+        self.enabled = True
+        self.active = True
+        self.alert = False
+        self.scale_y = 1.0
+
+    def _sub(self, *args, **kw):
+        return _Layout()
+
+    row = column = box = split = column_flow = grid_flow = _sub
+
+    def prop(self, data, attr, **kw):
+        getattr(data, attr)
+
+    def operator(self, idname, **kw):
+        return _OperatorProperties()
+
+    def label(self, **kw):
+        pass
+
+    def separator(self, **kw):
+        pass
+
+    def template_list(
+        self, listtype, list_id, data, prop, active_data, active_prop, **kw
+    ):
+        import bpy
+
+        cls = bpy.utils._registered.get(listtype)
+        if cls is None:
+            return
+        ul = cls()
+        coll = getattr(data, prop)
+        active = getattr(active_data, active_prop)
+        rows = kw.get("maxrows", 5)
+        # draw the visible rows around the active item, as Blender does
+        start = max(0, min(active, len(coll) - rows))
+        for i in range(start, min(len(coll), start + rows)):
+            ul.draw_item(
+                bpy.context, _Layout(), data, coll[i], 0, active_data, active_prop, i
+            )
+
+    def prop_search(self, data, attr, search_data, search_attr, **kw):
+        getattr(data, attr)
+
+    def operator_menu_enum(self, idname, prop, **kw):
+        pass
+
+
+class _OperatorProperties:
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+
+
+class Operator(bpy_struct):
+    bl_options = set()
+
+    def __init__(self):
+        super().__init__()
+        self.layout = _Layout()
+        self.reports = []
+
+    def report(self, kind, message):
+        self.reports.append((set(kind), message))
+
+    def as_keywords(self, ignore=()):
+        return {
+            name: getattr(self, name)
+            for name in type(self).__annotations__
+            if name not in ignore
+        }
+
+
+class Panel(bpy_struct):
+    def __init__(self):
+        super().__init__()
+        self.layout = _Layout()
+
+
+class UIList(bpy_struct):
+    use_filter_show = False
+
+
+class Menu(Panel):
+    pass
+
+
+# ---- ID types
+
+
+class ID(bpy_struct):
+    def __init__(self, name=""):
+        super().__init__()
+        self._name = name
+        self._store = None
+        self.users = 0
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._store is not None:
+            self._store._rename(self, value)
+        else:
+            self._name = value
+
+
+class Object(ID):
+    def __init__(self, name="", data=None):
+        super().__init__(name)
+        self.data = data
+        if data is not None:
+            data.users += 1
+        self._loc = [0.0, 0.0, 0.0]
+        self._rot_euler = [0.0, 0.0, 0.0]
+        self._rot_quat = [1.0, 0.0, 0.0, 0.0]
+        self._scale = [1.0, 1.0, 1.0]
+        self.rotation_mode = "XYZ"
+        self.hide_viewport = False
+        self.show_name = False
+        self.color = [1.0, 1.0, 1.0, 1.0]
+        self.parent = None
+        self.instance_type = "NONE"
+        self.modifiers = _Modifiers()
+        self.users_collection = []
+        # transform writes, as seen by the depsgraph
+        self.tag_count = 0
+
+    def _vec(attr, cls, size):
+        def fget(self):
+            def owner(vals, self=self):
+                setattr(self, attr, list(vals))
+                self.tag_count += 1
+
+            return cls(list(getattr(self, attr)), owner=owner)
+
+        def fset(self, value):
+            vals = [float(x) for x in value]
+            if len(vals) != size:
+                raise ValueError("size mismatch")
+            setattr(self, attr, vals)
+            self.tag_count += 1
+
+        return property(fget, fset)
+
+    location = _vec("_loc", mathutils.Vector, 3)
+    rotation_euler = _vec("_rot_euler", mathutils.Euler, 3)
+    rotation_quaternion = _vec("_rot_quat", mathutils.Quaternion, 4)
+    scale = _vec("_scale", mathutils.Vector, 3)
+
+    def copy(self):
+        import bpy
+
+        ob = bpy.data.objects.new(self.name, self.data)
+        ob._loc = list(self._loc)
+        ob._rot_euler = list(self._rot_euler)
+        ob._rot_quat = list(self._rot_quat)
+        ob._scale = list(self._scale)
+        ob.rotation_mode = self.rotation_mode
+        ob.color = list(self.color)
+        return ob
+
+
+class _Modifiers(list):
+    def new(self, name, type):
+        mod = _Modifier(name, type)
+        self.append(mod)
+        return mod
+
+    def get(self, name, default=None):
+        return next((m for m in self if m.name == name), default)
+
+
+class _Modifier:
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+        self.node_group = None
+        self.show_viewport = True
+
+
+class _MeshElements:
+    # vertices/edges: a flat float/int store with foreach access
+
+    def __init__(self, attr, size, typecode):
+        self._attr = attr
+        self._size = size
+        self._typecode = typecode
+        self._data = array(typecode)
+
+    def __len__(self):
+        return len(self._data) // self._size
+
+    def add(self, count):
+        self._data.extend([0] * (count * self._size))
+
+    def foreach_get(self, attr, seq):
+        if attr != self._attr or len(seq) != len(self._data):
+            raise RuntimeError(f"foreach_get('{attr}'): sequence size mismatch")
+        seq[:] = self._data.tolist()
+
+    def foreach_set(self, attr, seq):
+        if attr != self._attr or len(seq) != len(self._data):
+            raise RuntimeError(f"foreach_set('{attr}'): sequence size mismatch")
+        self._data = array(self._typecode, (x for x in seq))
+
+
+class _AttributeData:
+    def __init__(self, attr):
+        self._attr = attr
+
+    def __len__(self):
+        return len(self._attr._data) // self._attr._size
+
+    def foreach_get(self, name, seq):
+        seq[:] = self._attr._data.tolist()
+
+    def foreach_set(self, name, seq):
+        if len(seq) != len(self._attr._data):
+            raise RuntimeError(f"foreach_set('{name}'): sequence size mismatch")
+        self._attr._data = array("f", (float(x) for x in seq))
+
+    def __getitem__(self, i):
+        return _AttributeItem(self._attr, i)
+
+
+class _AttributeItem:
+    def __init__(self, attr, i):
+        object.__setattr__(self, "_attr", attr)
+        object.__setattr__(self, "_i", i)
+
+    def __setattr__(self, name, value):
+        a, s = self._attr, self._attr._size
+        vals = list(value) if s > 1 else [value]
+        a._data[self._i * s : (self._i + 1) * s] = array("f", vals)
+
+
+_ATTR_SIZE = {"FLOAT": 1, "INT": 1, "FLOAT_VECTOR": 3, "FLOAT_COLOR": 4}
+
+
+class _Attribute:
+    def __init__(self, name, type, domain, count):
+        self.name = name
+        self.data_type = type
+        self.domain = domain
+        self._size = _ATTR_SIZE[type]
+        self._data = array("f", [0.0] * (count * self._size))
+        self.data = _AttributeData(self)
+
+
+class _Attributes(dict):
+    def __init__(self, mesh):
+        super().__init__()
+        self._mesh = mesh
+
+    def new(self, name, type, domain):
+        count = len(self._mesh.vertices if domain == "POINT" else self._mesh.edges)
+        attr = self[name] = _Attribute(name, type, domain, count)
+        return attr
+
+    def remove(self, attr):
+        del self[attr.name]
+
+    def get(self, name, default=None):
+        return super().get(name, default)
+
+
+class Mesh(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.vertices = _MeshElements("co", 3, "f")
+        self.edges = _MeshElements("vertices", 2, "i")
+        self.attributes = _Attributes(self)
+        self.materials = []
+        self.update_count = 0
+
+    def clear_geometry(self):
+        self.vertices = _MeshElements("co", 3, "f")
+        self.edges = _MeshElements("vertices", 2, "i")
+        self.attributes.clear()
+
+    def update(self, **kw):
+        self.update_count += 1
+
+    def from_pydata(self, vertices, edges, faces):
+        self.clear_geometry()
+        self.vertices.add(len(vertices))
+        self.vertices.foreach_set("co", [c for v in vertices for c in v])
+        self.edges.add(len(edges))
+        self.edges.foreach_set("vertices", [i for e in edges for i in e])
+
+
+class _Socket:
+    def __init__(self, name, enabled=True):
+        self.name = name
+        self.enabled = enabled
+        self.default_value = None
+        self.links = []
+
+
+class _Sockets(list):
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for s in self:
+                if s.name == key:
+                    return s
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+    def new(self, type, name):
+        s = _Socket(name)
+        self.append(s)
+        return s
+
+
+class _Node:
+    def __init__(self, type):
+        self.bl_idname = type
+        self.type = _NODE_TYPES.get(type, type)
+        self.location = (0, 0)
+        self.data_type = "FLOAT"
+        self.inputs = _Sockets(_Socket(n) for n in _NODE_INPUTS.get(type, ()))
+        self.outputs = _Sockets(_Socket(n) for n in _NODE_OUTPUTS.get(type, ()))
+
+
+_NODE_TYPES = {
+    "ShaderNodeBsdfPrincipled": "BSDF_PRINCIPLED",
+    "ShaderNodeOutputMaterial": "OUTPUT_MATERIAL",
+    "ShaderNodeAttribute": "ATTRIBUTE",
+}
+
+_NODE_INPUTS = {
+    "GeometryNodeSetMaterial": ("Geometry", "Selection", "Material"),
+    "ShaderNodeBsdfPrincipled": ("Base Color",),
+    "ShaderNodeOutputMaterial": ("Surface",),
+    "GeometryNodeInstanceOnPoints": (
+        "Points",
+        "Selection",
+        "Instance",
+        "Pick Instance",
+        "Instance Index",
+        "Rotation",
+        "Scale",
+    ),
+    "GeometryNodeObjectInfo": ("Object", "As Instance"),
+    "GeometryNodeRealizeInstances": ("Geometry",),
+    "GeometryNodeInputNamedAttribute": ("Name",),
+    "GeometryNodeStoreNamedAttribute": ("Geometry", "Name", "Value"),
+    "NodeGroupOutput": ("Geometry",),
+}
+_NODE_OUTPUTS = {
+    "GeometryNodeSetMaterial": ("Geometry",),
+    "ShaderNodeBsdfPrincipled": ("BSDF",),
+    "ShaderNodeAttribute": ("Color", "Vector", "Fac", "Alpha"),
+    "GeometryNodeInstanceOnPoints": ("Instances",),
+    "GeometryNodeObjectInfo": ("Location", "Rotation", "Scale", "Geometry"),
+    "GeometryNodeRealizeInstances": ("Geometry",),
+    "GeometryNodeInputNamedAttribute": ("Attribute",),
+    "GeometryNodeStoreNamedAttribute": ("Geometry",),
+    "NodeGroupInput": ("Geometry",),
+}
+
+
+class _Nodes(list):
+    def new(self, type):
+        node = _Node(type)
+        self.append(node)
+        return node
+
+    def clear(self):
+        del self[:]
+
+
+class _Links(list):
+    def new(self, a, b):
+        self.append((a, b))
+        b.links.append(a)
+
+
+class NodeTree(ID):
+    def __init__(self, name="", type=""):
+        super().__init__(name)
+        self.bl_idname = type
+        self.nodes = _Nodes()
+        self.links = _Links()
+        self.inputs = _Sockets()
+        self.outputs = _Sockets()
+
+
+class Material(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self._use_nodes = False
+        self.node_tree = None
+
+    @property
+    def use_nodes(self):
+        return self._use_nodes
+
+    @use_nodes.setter
+    def use_nodes(self, value):
+        self._use_nodes = value
+        if value and self.node_tree is None:
+            self.node_tree = NodeTree(self.name, "ShaderNodeTree")
+            bsdf = self.node_tree.nodes.new("ShaderNodeBsdfPrincipled")
+            out = self.node_tree.nodes.new("ShaderNodeOutputMaterial")
+            self.node_tree.links.new(bsdf.outputs[0], out.inputs[0])
+        self.diffuse_color = [0.8, 0.8, 0.8, 1.0]
+
+
+class _CollectionObjects:
+    def __init__(self):
+        self._obs = []
+
+    def link(self, ob):
+        if ob in self._obs:
+            raise RuntimeError(f"Object '{ob.name}' already in collection")
+        self._obs.append(ob)
+        ob.users += 1
+        ob.users_collection.append(self)
+
+    def unlink(self, ob):
+        self._obs.remove(ob)
+        ob.users -= 1
+        ob.users_collection.remove(self)
+
+    def __len__(self):
+        return len(self._obs)
+
+    def __iter__(self):
+        return iter(list(self._obs))
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(o.name == key for o in self._obs)
+        return key in self._obs
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for ob in self._obs:
+                if ob.name == key:
+                    return ob
+            raise KeyError(key)
+        return self._obs[key]
+
+
+class _CollectionChildren(list):
+    def link(self, coll):
+        self.append(coll)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(c.name == key for c in self)
+        return super().__contains__(key)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for c in self:
+                if c.name == key:
+                    return c
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+
+class Collection(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.objects = _CollectionObjects()
+        self.children = _CollectionChildren()
+
+
+class _Render:
+    fps = 24
+
+
+class Scene(ID):
+    def __init__(self, name="Scene"):
+        super().__init__(name)
+        self.collection = Collection("Scene Collection")
+        self.frame_current = 1
+        self.frame_start = 1
+        self.frame_end = 250
+        self.render = _Render()
+
+    def frame_set(self, frame, subframe=0.0):
+        import bpy
+
+        self.frame_current = frame
+        for h in list(bpy.app.handlers.frame_change_pre):
+            h(self)
+
+
+class WindowManager(ID):
+    def invoke_search_popup(self, op):
+        return {"RUNNING_MODAL"}
+
+    def invoke_props_dialog(self, op, **kw):
+        return {"RUNNING_MODAL"}
+
+    def fileselect_add(self, op):
+        return {"RUNNING_MODAL"}
@@ -0,0 +1,49 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+# Class registration: binds annotated properties to their attribute names.
+
+
+from . import props as _props
+
+_registered = {}
+_operators = {}
+
+
+def register_class(cls):
+    if cls.__name__ in _registered:
+        raise ValueError(
+            f"register_class(...): already registered as a subclass '{cls.__name__}'"
+        )
+    for name, prop in getattr(cls, "__annotations__", {}).items():
+        if isinstance(prop, _props._Prop):
+            setattr(cls, name, prop)
+    _registered[cls.__name__] = cls
+    idname = getattr(cls, "bl_idname", None)
+    if idname and "." in idname:
+        _operators[idname] = cls
+
+
+def unregister_class(cls):
+    _registered.pop(cls.__name__, None)
+    idname = getattr(cls, "bl_idname", None)
+    if idname:
+        _operators.pop(idname, None)
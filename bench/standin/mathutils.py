@@ -0,0 +1,294 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+# Headless stand-in for the parts of Blender's 'mathutils' used by the
+# examples. Arithmetic follows Blender's C implementation (BLI_math) so that
+# results can be compared against the NumPy code paths.
+
+
+from math import acos, atan2, cos, hypot, pi, sin, sqrt
+
+FLT_EPSILON = 1.1920929e-07
+
+
+class _Math:
+    # common base: a list of floats that can write itself back to its owner
+
+    size = 0
+
+    def __init__(self, seq=None, owner=None):
+        if seq is None:
+            seq = self._default()
+        self._v = [float(x) for x in seq]
+        if len(self._v) != self.size:
+            raise ValueError(f"{type(self).__name__}: expected {self.size} values")
+        # owner callback, called with the new values after each mutation
+        self._owner = owner
+
+    def _default(self):
+        return [0.0] * self.size
+
+    def _sync(self):
+        if self._owner is not None:
+            self._owner(self._v)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def __getitem__(self, i):
+        return self._v[i]
+
+    def __setitem__(self, i, val):
+        if isinstance(i, slice):
+            self._v[i] = [float(x) for x in val]
+        else:
+            self._v[i] = float(val)
+        self._sync()
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        vals = ", ".join(f"{x:.4f}" for x in self._v)
+        return f"{type(self).__name__}(({vals}))"
+
+    def copy(self):
+        return type(self)(self._v)
+
+    def to_tuple(self):
+        return tuple(self._v)
+
+
+class Vector(_Math):
+    def __init__(self, seq=(0, 0, 0), owner=None):
+        self.size = len(seq)
+        super().__init__(seq, owner)
+
+    x = property(lambda s: s._v[0], lambda s, v: s.__setitem__(0, v))
+    y = property(lambda s: s._v[1], lambda s, v: s.__setitem__(1, v))
+    z = property(lambda s: s._v[2], lambda s, v: s.__setitem__(2, v))
+
+    def __add__(self, other):
+        return Vector([a + b for a, b in zip(self, other)])
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Vector([a - b for a, b in zip(self, other)])
+
+    def __rsub__(self, other):
+        return Vector([b - a for a, b in zip(self, other)])
+
+    def __mul__(self, f):
+        return Vector([a * f for a in self])
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Vector([-a for a in self])
+
+    def __matmul__(self, other):
+        return self.dot(other)
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self, other))
+
+    def cross(self, other):
+        a, b = self._v, list(other)
+        return Vector(
+            (
+                a[1] * b[2] - a[2] * b[1],
+                a[2] * b[0] - a[0] * b[2],
+                a[0] * b[1] - a[1] * b[0],
+            )
+        )
+
+    @property
+    def length(self):
+        return sqrt(sum(a * a for a in self._v))
+
+    def normalized(self):
+        n = self.length
+        return Vector([a / n for a in self._v]) if n else Vector(self._v)
+
+    def rotation_difference(self, other):
+        # rotation_between_vecs_to_quat
+        v1 = self.normalized()
+        v2 = Vector(other).normalized()
+        axis = v1.cross(v2)
+        n = axis.length
+        if n > FLT_EPSILON:
+            d = max(-1.0, min(1.0, v1.dot(v2)))
+            return _axis_angle_to_quat([a / n for a in axis], acos(d))
+        if v1.dot(v2) > 0:
+            return Quaternion()
+        return _axis_angle_to_quat(_ortho(v1), pi)
+
+
+def _ortho(v):
+    # ortho_v3_v3
+    ax = max(range(3), key=lambda i: abs(v[i]))
+    if ax == 0:
+        out = (-v[1] - v[2], v[0], v[0])
+    elif ax == 1:
+        out = (v[1], -v[0] - v[2], v[1])
+    else:
+        out = (v[2], v[2], -v[0] - v[1])
+    n = sqrt(sum(a * a for a in out))
+    return [a / n for a in out]
+
+
+def _axis_angle_to_quat(axis, angle):
+    s = sin(angle * 0.5)
+    return Quaternion((cos(angle * 0.5), axis[0] * s, axis[1] * s, axis[2] * s))
+
+
+class Quaternion(_Math):
+    size = 4
+
+    def _default(self):
+        return [1.0, 0.0, 0.0, 0.0]
+
+    w = property(lambda s: s._v[0], lambda s, v: s.__setitem__(0, v))
+    x = property(lambda s: s._v[1], lambda s, v: s.__setitem__(1, v))
+    y = property(lambda s: s._v[2], lambda s, v: s.__setitem__(2, v))
+    z = property(lambda s: s._v[3], lambda s, v: s.__setitem__(3, v))
+
+    def __matmul__(self, other):
+        a = self._v
+        if isinstance(other, Quaternion):
+            # mul_qt_qtqt
+            b = other._v
+            return Quaternion(
+                (
+                    a[0] * b[0] - a[1] * b[1] - a[2] * b[2] - a[3] * b[3],
+                    a[0] * b[1] + a[1] * b[0] + a[2] * b[3] - a[3] * b[2],
+                    a[0] * b[2] + a[2] * b[0] + a[3] * b[1] - a[1] * b[3],
+                    a[0] * b[3] + a[3] * b[0] + a[1] * b[2] - a[2] * b[1],
+                )
+            )
+        # mul_qt_v3
+        r = list(other)
+        t0 = -a[1] * r[0] - a[2] * r[1] - a[3] * r[2]
+        t1 = a[0] * r[0] + a[2] * r[2] - a[3] * r[1]
+        t2 = a[0] * r[1] + a[3] * r[0] - a[1] * r[2]
+        i3 = a[0] * r[2] + a[1] * r[1] - a[2] * r[0]
+        return Vector(
+            (
+                t1 * a[0] - t0 * a[1] - t2 * a[3] + i3 * a[2],
+                t2 * a[0] - t0 * a[2] - i3 * a[1] + t1 * a[3],
+                i3 * a[0] - t0 * a[3] - t1 * a[2] + t2 * a[1],
+            )
+        )
+
+    def normalized(self):
+        n = sqrt(sum(a * a for a in self._v))
+        return Quaternion([a / n for a in self._v]) if n else Quaternion()
+
+    def to_matrix(self):
+        # quat_to_mat3, returned row-major
+        q0, q1, q2, q3 = (a * sqrt(2.0) for a in self._v)
+        qda, qdb, qdc = q0 * q1, q0 * q2, q0 * q3
+        qaa, qab, qac = q1 * q1, q1 * q2, q1 * q3
+        qbb, qbc, qcc = q2 * q2, q2 * q3, q3 * q3
+        # column-major as in BLI_math
+        m = [
+            [1.0 - qbb - qcc, qdc + qab, -qdb + qac],
+            [-qdc + qab, 1.0 - qaa - qcc, qda + qbc],
+            [qdb + qac, -qda + qbc, 1.0 - qaa - qbb],
+        ]
+        return Matrix([[m[c][r] for c in range(3)] for r in range(3)])
+
+    def to_euler(self, order="XYZ"):
+        return self.to_matrix().to_euler(order)
+
+
+class Euler(_Math):
+    size = 3
+
+    def __init__(self, seq=(0, 0, 0), order="XYZ", owner=None):
+        super().__init__(seq, owner)
+        self.order = order
+
+    x = property(lambda s: s._v[0], lambda s, v: s.__setitem__(0, v))
+    y = property(lambda s: s._v[1], lambda s, v: s.__setitem__(1, v))
+    z = property(lambda s: s._v[2], lambda s, v: s.__setitem__(2, v))
+
+    def to_quaternion(self):
+        # eul_to_quat (XYZ order)
+        ti, tj, th = (a * 0.5 for a in self._v)
+        ci, cj, ch = cos(ti), cos(tj), cos(th)
+        si, sj, sh = sin(ti), sin(tj), sin(th)
+        cc, cs, sc, ss = ci * ch, ci * sh, si * ch, si * sh
+        return Quaternion(
+            (
+                cj * cc + sj * ss,
+                cj * sc - sj * cs,
+                cj * ss + sj * cc,
+                cj * cs - sj * sc,
+            )
+        )
+
+
+class Color(_Math):
+    size = 3
+
+
+class Matrix:
+    def __init__(self, rows=None):
+        if rows is None:
+            rows = [[float(i == j) for j in range(4)] for i in range(4)]
+        self._rows = [[float(x) for x in r] for r in rows]
+
+    @classmethod
+    def Identity(cls, size):
+        return cls([[float(i == j) for j in range(size)] for i in range(size)])
+
+    def __getitem__(self, i):
+        return self._rows[i]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def to_euler(self, order="XYZ"):
+        # mat3_normalized_to_eul2, picking the smallest solution
+        m = [[self._rows[r][c] for r in range(3)] for c in range(3)]
+        cy = hypot(m[0][0], m[0][1])
+        if cy > 16.0 * FLT_EPSILON:
+            e1 = (atan2(m[1][2], m[2][2]), atan2(-m[0][2], cy), atan2(m[0][1], m[0][0]))
+            e2 = (
+                atan2(-m[1][2], -m[2][2]),
+                atan2(-m[0][2], -cy),
+                atan2(-m[0][1], -m[0][0]),
+            )
+            e = min(e1, e2, key=lambda e: sum(abs(a) for a in e))
+        else:
+            e = (atan2(-m[2][1], m[1][1]), atan2(-m[0][2], cy), 0.0)
+        return Euler(e, order)
@@ -23,38 +23,67 @@
 
 
 import bpy
+import os
+import sys
+
+
+def script_dir():
+    # the shared helpers (enum_utils.py) are next to this file. Run from the
+    # Text Editor, '__file__' is '<blend file>/<text name>': the folder is that
+    # of the file the text was opened from. An internal text (not saved to a
+    # file) needs the helpers loaded as text blocks too (see README)
+    text = getattr(bpy.data, "texts", {}).get(os.path.basename(__file__))
+    if text and text.filepath:
+        return os.path.dirname(bpy.path.abspath(text.filepath))
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+sys.path.insert(0, script_dir())
+from enum_utils import EnumGroup  # noqa: E402
 
 
 # ------------------------------------------------------------------------------
 #
 # ----------------------------- PROPERTIES -------------------------------------
 
+AXES = (
+    ("X", "X", "X"),
+    ("Y", "Y", "Y"),
+    ("Z", "Z", "Z"),
+    ("-X", "-X", "-X"),
+    ("-Y", "-Y", "-Y"),
+    ("-Z", "-Z", "-Z"),
+)
+
+# 'track' and 'up' cannot use the same axis (in either direction). The group
+# works out the valid 'up' items for every 'track' value once, here, so the
+# items callback below is a table lookup that always returns the same tuples
+axis_group = EnumGroup(
+    (("track", AXES, 1), ("up", AXES[:3], 2)),
+    clash=lambda name_a, a, name_b, b: a % 3 == b % 3,
+)
+
 
 class DENUMSYNC_props(bpy.types.PropertyGroup):
-    def up_items(self, context):
-        # this function will populate 'up' enum with valid entries
-        # that do not clash with currently selected 'track' value
-        names = ["X", "Y", "Z"]
-        t = self.get("track", 1)
-        items = []
-        for i in range(3):
-            if t in [i, i + 3]:
-                continue
-            items.append((names[i], names[i], names[i]))
-        return items
+    # this function will populate 'up' enum with valid entries
+    # that do not clash with currently selected 'track' value
+    up_items = axis_group.items("up")
+
+    def track_update(self, context):
+        # the items keep their numbers (position in AXES), so a stored 'up'
+        # that now clashes is not in the new items: move it to the next valid
+        # one (an unset 'up' reads as 0, the first item)
+        resolve = axis_group.resolve_table["up"][axis_group.key(self, "up")]
+        up = self.get("up", 0)
+        if resolve[up] != up:
+            self["up"] = resolve[up]
 
     track: bpy.props.EnumProperty(
         name="Track",
         description="track axis",
-        items=(
-            ("X", "X", "X"),
-            ("Y", "Y", "Y"),
-            ("Z", "Z", "Z"),
-            ("-X", "-X", "-X"),
-            ("-Y", "-Y", "-Y"),
-            ("-Z", "-Z", "-Z"),
-        ),
+        items=AXES,
         default="Y",
+        update=track_update,
     )
 
     up: bpy.props.EnumProperty(
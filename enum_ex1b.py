@@ -24,47 +24,68 @@
 
 
 import bpy
+import os
+import sys
+
+
+def script_dir():
+    # the shared helpers (enum_utils.py) are next to this file. Run from the
+    # Text Editor, '__file__' is '<blend file>/<text name>': the folder is that
+    # of the file the text was opened from. An internal text (not saved to a
+    # file) needs the helpers loaded as text blocks too (see README)
+    text = getattr(bpy.data, "texts", {}).get(os.path.basename(__file__))
+    if text and text.filepath:
+        return os.path.dirname(bpy.path.abspath(text.filepath))
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+sys.path.insert(0, script_dir())
+from enum_utils import EnumGroup, SlotGroup  # noqa: E402
 
 
 # ------------------------------------------------------------------------------
 #
 # ----------------------------- PROPERTIES -------------------------------------
 
+AXES = (
+    ("X", "X", "X"),
+    ("Y", "Y", "Y"),
+    ("Z", "Z", "Z"),
+    ("-X", "-X", "-X"),
+    ("-Y", "-Y", "-Y"),
+    ("-Z", "-Z", "-Z"),
+)
+
+# 'track' and 'up' cannot use the same axis (in either direction). On a clash
+# the selected index moves on to the next valid one; the group precomputes
+# that mapping for every value of the other property
+# note: the default values for the group must be numeric indices
+axis_group = EnumGroup(
+    (("track", AXES, 1), ("up", AXES[:3], 2)),
+    clash=lambda name_a, a, name_b, b: a % 3 == b % 3,
+)
+
+
+# the same get/set pattern for any number of properties: four "lanes" that
+# must each use a different slot. The occupied slots are the bits of the
+# 'slot_mask' property, so a clash is found (and the next free slot picked)
+# with a few bit operations instead of reading the other lanes
+SLOTS = tuple((f"S{i}", f"Slot {i}", f"slot {i}") for i in range(1, 9))
+LANES = ("lane_a", "lane_b", "lane_c", "lane_d")
+lane_group = SlotGroup(LANES, SLOTS, mask="slot_mask")
+
 
 class DENUMS2_props(bpy.types.PropertyGroup):
-    def track_get(self):
-        # note: the default value for enum-property must be a numeric index
-        return self.get("track", 1)
-
-    def track_set(self, value):
-        # note: the 'value' parameter also holds a numeric index
-        u = self.get("up", 2)
-        if value in [u, u + 3]:
-            # adjust selected index so it does not clash with UP property
-            value = value + 1 if value < 5 else 0
-        self["track"] = value
-
-    def up_get(self):
-        return self.get("up", 2)
-
-    def up_set(self, value):
-        t = self.get("track", 1)
-        if t in [value, value + 3]:
-            # adjust selected index so it does not clash with TRACK property
-            value = value + 1 if value < 2 else 0
-        self["up"] = value
+    # note: the 'value' parameter of the set callbacks holds a numeric index
+    track_get = axis_group.getter("track")
+    track_set = axis_group.setter("track")
+    up_get = axis_group.getter("up")
+    up_set = axis_group.setter("up")
 
     track: bpy.props.EnumProperty(
         name="Track",
         description="track axis",
-        items=(
-            ("X", "X", "X"),
-            ("Y", "Y", "Y"),
-            ("Z", "Z", "Z"),
-            ("-X", "-X", "-X"),
-            ("-Y", "-Y", "-Y"),
-            ("-Z", "-Z", "-Z"),
-        ),
+        items=AXES,
         default="Y",
         get=track_get,
         set=track_set,
@@ -73,12 +94,41 @@ class DENUMS2_props(bpy.types.PropertyGroup):
     up: bpy.props.EnumProperty(
         name="Up",
         description="up axis",
-        items=(("X", "X", "X"), ("Y", "Y", "Y"), ("Z", "Z", "Z")),
+        items=AXES[:3],
         default="Z",
         get=up_get,
         set=up_set,
     )
 
+    # occupied lane slots (bit i set: slot i is taken)
+    slot_mask: bpy.props.IntProperty(
+        default=lane_group.initial_mask, options={"HIDDEN"}
+    )
+    lane_a: bpy.props.EnumProperty(
+        name="Lane A",
+        items=SLOTS,
+        get=lane_group.getter("lane_a"),
+        set=lane_group.setter("lane_a"),
+    )
+    lane_b: bpy.props.EnumProperty(
+        name="Lane B",
+        items=SLOTS,
+        get=lane_group.getter("lane_b"),
+        set=lane_group.setter("lane_b"),
+    )
+    lane_c: bpy.props.EnumProperty(
+        name="Lane C",
+        items=SLOTS,
+        get=lane_group.getter("lane_c"),
+        set=lane_group.setter("lane_c"),
+    )
+    lane_d: bpy.props.EnumProperty(
+        name="Lane D",
+        items=SLOTS,
+        get=lane_group.getter("lane_d"),
+        set=lane_group.setter("lane_d"),
+    )
+
 
 # ------------------------------------------------------------------------------
 #
@@ -103,6 +153,12 @@ class DENUMS2_PT_ui(bpy.types.Panel):
         row = col.row(align=True)
         row.prop(props, "track", text="")
         row.prop(props, "up", text="")
+        box = layout.box()
+        col = box.column(align=True)
+        col.label(text="Lanes")
+        row = col.row(align=True)
+        for name in LANES:
+            row.prop(props, name, text="")
 
 
 # ------------------------------------------------------------------------------
@@ -23,6 +23,48 @@
 
 
 import bpy
+import os
+import sys
+
+
+def script_dir():
+    # the shared helpers (enum_utils.py) are next to this file. Run from the
+    # Text Editor, '__file__' is '<blend file>/<text name>': the folder is that
+    # of the file the text was opened from. An internal text (not saved to a
+    # file) needs the helpers loaded as text blocks too (see README)
+    text = getattr(bpy.data, "texts", {}).get(os.path.basename(__file__))
+    if text and text.filepath:
+        return os.path.dirname(bpy.path.abspath(text.filepath))
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+sys.path.insert(0, script_dir())
+from enum_utils import enum_cache  # noqa: E402
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------ OPTIONS LIST ----------------------------------
+
+
+def column_name(i):
+    # spreadsheet column names: A, B, ... Z, AA, AB, ...
+    name = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        name = chr(65 + r) + name
+    return name
+
+
+# the source list: 10000 names, made once
+NAMES = tuple(column_name(i) for i in range(10000))
+# every item has a fixed number (4th value): the stored index of 'optenum' is
+# the position in NAMES, whatever the number of items shown
+ITEMS = tuple((name, name, name, i) for i, name in enumerate(NAMES))
+# above this number of items, the panel offers a search popup instead of the
+# (very long) dropdown
+SEARCH_MIN = 50
 
 
 # ------------------------------------------------------------------------------
@@ -31,21 +73,22 @@ import bpy
 
 
 class DENUMCTRL_props(bpy.types.PropertyGroup):
+    # the items only depend on 'ctrl': 'enum_cache' returns the same tuple for
+    # the same value, which also keeps its strings alive, as dynamic enums
+    # require (the last 32 values are kept)
+    @enum_cache(key=lambda self, context: self.ctrl, maxsize=32)
     def optenum_items(self, context):
         # this function will populate 'optenum' with a number of items
         # from the 'names' list, specified by the 'ctrl' property
-        names = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L"]
-        items = []
-        for i in range(self.ctrl):
-            items.append((names[i], names[i], names[i]))
-        return items
+        return ITEMS[: self.ctrl]
 
     def ctrl_update(self, context):
         # note: you MUST select index here, otherwise it will be undefined
-        # In this case, we set it to the last item in the list
-        names = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L"]
-        items = self.get("ctrl", 3)
-        self.optenum = names[items - 1]
+        # The item numbers do not depend on 'ctrl', so the current index stays
+        # valid while it is shown. Otherwise we set it to the last item
+        count = self.get("ctrl", 3)
+        if self.get("optenum", 0) >= count:
+            self["optenum"] = count - 1
 
     # enumerated list
     optenum: bpy.props.EnumProperty(
@@ -54,7 +97,41 @@ class DENUMCTRL_props(bpy.types.PropertyGroup):
         items=optenum_items,
     )
     # controls the number of items for enumerated list
-    ctrl: bpy.props.IntProperty(default=3, min=3, max=12, update=ctrl_update)
+    ctrl: bpy.props.IntProperty(default=3, min=3, max=len(NAMES), update=ctrl_update)
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------- OPERATORS ------------------------------------
+
+
+class DENUMCTRL_OT_search(bpy.types.Operator):
+    bl_label = "Search Options"
+    bl_idname = "denumctrl.search"
+    bl_description = "search the options list"
+    bl_options = {"REGISTER", "INTERNAL", "UNDO"}
+    # the enum the search popup filters as you type
+    bl_property = "option"
+
+    def option_items(self, context):
+        # the same (cached) items as 'optenum'
+        props = context.scene.denum_opt
+        return DENUMCTRL_props.optenum_items(props, context)
+
+    option: bpy.props.EnumProperty(items=option_items)
+
+    def invoke(self, context, event):
+        context.window_manager.invoke_search_popup(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        props = context.scene.denum_opt
+        try:
+            props.optenum = self.option
+        except Exception as my_err:
+            print(f"search: {my_err.args}")
+            return {"CANCELLED"}
+        return {"FINISHED"}
 
 
 # ------------------------------------------------------------------------------
@@ -77,7 +154,10 @@ class DENUMCTRL_PT_ui(bpy.types.Panel):
         row.label(text="Items:")
         row.prop(props, "ctrl", text="")
         row = box.row(align=True)
-        row.prop(props, "optenum", text="")
+        if props.ctrl < SEARCH_MIN:
+            row.prop(props, "optenum", text="")
+        else:
+            row.operator("denumctrl.search", text=props.optenum, icon="VIEWZOOM")
         row = box.row(align=True)
         row.label(text="Current Index")
         row.label(text=f'{props.get("optenum", 0)}')
@@ -89,6 +169,7 @@ class DENUMCTRL_PT_ui(bpy.types.Panel):
 
 classes = (
     DENUMCTRL_props,
+    DENUMCTRL_OT_search,
     DENUMCTRL_PT_ui,
 )
 
@@ -26,7 +26,118 @@
 
 
 import bpy
-import uuid
+import os
+import sys
+
+from bpy.app.handlers import persistent
+from itertools import count
+
+
+def script_dir():
+    # the shared helpers (enum_utils.py) are next to this file. Run from the
+    # Text Editor, '__file__' is '<blend file>/<text name>': the folder is that
+    # of the file the text was opened from. An internal text (not saved to a
+    # file) needs the helpers loaded as text blocks too (see README)
+    text = getattr(bpy.data, "texts", {}).get(os.path.basename(__file__))
+    if text and text.filepath:
+        return os.path.dirname(bpy.path.abspath(text.filepath))
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+sys.path.insert(0, script_dir())
+from enum_utils import enum_cache, ids_read, uid_new, uids_migrate  # noqa: E402
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------ LOOKUP CACHE ----------------------------------
+
+# Blender creates a new python object every time we access a PropertyGroup, so
+# we cannot store python data on 'DENUMUL_props' itself. Instead, we keep the
+# lookup tables here, keyed by the memory address of the props struct. They
+# are built the first time they are needed and dropped whenever the 'subs'
+# collection or any 'pid' changes (add, remove, parent, undo, file load).
+
+
+class SubsCache:
+    def __init__(self, subs):
+        # index -> uid, and the parent uids (two bulk reads)
+        self.uids, pids = ids_read(subs)
+        # uid -> index
+        self.lookup = dict(zip(self.uids, range(len(self.uids))))
+        # index -> parent index (-1 for root items)
+        self.parents = [self.lookup.get(pid, -1) if pid else -1 for pid in pids]
+        # parent index -> child indices (key -1 holds the root items)
+        self.children = {}
+        for i, p in enumerate(self.parents):
+            self.children.setdefault(p, []).append(i)
+        self.tour_build()
+        # a new number for every new cache, i.e. for every change of the tree
+        self.tree = next(_trees)
+        # renames counter, see 'DENUMUL_sub.name_update'
+        self.names = 0
+
+    def tour_build(self):
+        # Euler tour: we walk the forest depth-first and number the items in
+        # the order we enter them ('tin'). The descendants of an item are
+        # entered after it and before we leave it, so they get the numbers
+        # tin[i]+1 ... tout[i], where 'tout' is the last number given inside
+        # the subtree. Is 'j' a descendant of 'i'? -> tin[i] < tin[j] <= tout[i]
+        n = len(self.uids)
+        self.tin = [0] * n
+        self.tout = [0] * n
+        self.depth = [0] * n
+        # tin -> index (items in depth-first order)
+        self.tour = []
+        # - the stack holds (item, depth) to enter, and (~item, 0) to leave
+        stack = [(i, 0) for i in reversed(self.children.get(-1, ()))]
+        while stack:
+            i, d = stack.pop()
+            if i < 0:
+                self.tout[~i] = len(self.tour) - 1
+                continue
+            self.tin[i] = len(self.tour)
+            self.depth[i] = d
+            self.tour.append(i)
+            stack.append((~i, 0))
+            stack.extend((c, d + 1) for c in reversed(self.children.get(i, ())))
+        # - items in a parent loop cannot be reached from a root (the UI does
+        #   not allow loops): we number them as single items
+        if len(self.tour) < n:
+            for i in sorted(set(range(n)).difference(self.tour)):
+                self.tin[i] = self.tout[i] = len(self.tour)
+                self.tour.append(i)
+
+
+_caches = {}
+_trees = count()
+
+
+def cache_get(props):
+    key = props.as_pointer()
+    cache = _caches.get(key)
+    # the length check catches collection changes made outside our operators
+    if cache is None or len(cache.uids) != len(props.subs):
+        cache = _caches[key] = SubsCache(props.subs)
+    return cache
+
+
+def cache_reset(props):
+    _caches.pop(props.as_pointer(), None)
+
+
+@persistent
+def denumul_cache_clear(*args):
+    # undo and file loading re-allocate the props, so we drop all tables
+    _caches.clear()
+    DENUMUL_props.parent_enum_items.cache_clear()
+
+
+def parent_enum_key(props, context):
+    # the 'parent_enum' items depend on: which props, the tree, the names and
+    # the selected item. Only when one of them changes are the items rebuilt
+    cache = cache_get(props)
+    return (props.as_pointer(), cache.tree, cache.names, props.subs_idx)
 
 
 # ------------------------------------------------------------------------------
@@ -37,25 +148,67 @@ import uuid
 class DENUMUL_sub(bpy.types.PropertyGroup):
     # user-list item properties
 
-    name: bpy.props.StringProperty(default="sub")
-    # item/parent unique ids
-    uid: bpy.props.StringProperty(default="")
-    pid: bpy.props.StringProperty(default="")
+    def name_update(self, context):
+        # the 'parent_enum' items show the names, so they must be rebuilt
+        cache = _caches.get(self.id_data.denumul_props.as_pointer())
+        if cache:
+            cache.names += 1
 
+    name: bpy.props.StringProperty(default="sub", update=name_update)
+    # item/parent unique ids (see 'uid_new'), pid 0: no parent
+    uid: bpy.props.IntProperty(default=0)
+    pid: bpy.props.IntProperty(default=0)
 
-class DENUMUL_props(bpy.types.PropertyGroup):
-    def descendants(self, key, lst=[]):
-        # for any item with uid==key, return a list of uids of dependent items
-        # - first, we get the item's children
-        cuids = [sub.uid for sub in self.subs if sub.pid == key]
-        # - then, for each child...
-        for cuid in cuids:
-            # - we append its uid to the list
-            lst.append(cuid)
-            # - and call the function recursively to traverse the tree of descendants
-            lst = self.descendants(cuid, lst)
-        return lst
 
+class DENUMUL_props(bpy.types.PropertyGroup):
+    def uid_index(self, uid):
+        # index of the item with uid==uid, -1 if not found
+        return cache_get(self).lookup.get(uid, -1)
+
+    def cache_reset(self):
+        cache_reset(self)
+
+    # ---- tree queries (see 'SubsCache.tour_build')
+
+    def is_descendant(self, idx, anc):
+        # True if the item at index==idx is below the item at index==anc
+        cache = cache_get(self)
+        return cache.tin[anc] < cache.tin[idx] <= cache.tout[anc]
+
+    def descendants(self, idx):
+        # for the item at index==idx, return a set of indices of dependent items
+        cache = cache_get(self)
+        # - they are the items numbered after it, up to its 'tout'
+        return set(cache.tour[cache.tin[idx] + 1 : cache.tout[idx] + 1])
+
+    def subtree(self, idx):
+        # the item at index==idx followed by all items below it (depth-first)
+        cache = cache_get(self)
+        return cache.tour[cache.tin[idx] : cache.tout[idx] + 1]
+
+    def subtree_size(self, idx):
+        # number of items in the subtree of index==idx, the item included
+        cache = cache_get(self)
+        return cache.tout[idx] - cache.tin[idx] + 1
+
+    def depth(self, idx):
+        # 0 for root items, 1 for their children, and so on
+        return cache_get(self).depth[idx]
+
+    def ancestors(self, idx):
+        # indices from the parent of index==idx up to its root
+        parents = cache_get(self).parents
+        aids = []
+        p = parents[idx]
+        while p > -1 and len(aids) < len(parents):
+            aids.append(p)
+            p = parents[p]
+        return aids
+
+    # Blender calls this on every redraw of the panel, so 'enum_cache' returns
+    # the same items until 'parent_enum_key' changes. Keeping the items alive
+    # also keeps their strings alive, as dynamic enums require
+    @enum_cache(key=parent_enum_key)
     def parent_enum_items(self, context):
         # this function returns the items that will populate the 'parent_enum' list
         items = []
@@ -63,12 +216,15 @@ class DENUMUL_props(bpy.types.PropertyGroup):
             return items
         # current user-list selected item
         idx = self.subs_idx
-        key = self.subs[idx].uid
-        # selected item's descendants
-        duids = self.descendants(key, [])
+        cache = cache_get(self)
+        # the selected item and its descendants are numbered lo...hi in the
+        # Euler tour (no selection: exclude everything, as there is no item)
+        lo, hi = 0, len(self.subs) - 1
+        if idx > -1:
+            lo, hi = cache.tin[idx], cache.tout[idx]
         # we want valid parent candidates, excluding current item and its descendants
         for i, item in enumerate(self.subs):
-            if (i == idx) or (item.uid in duids):
+            if lo <= cache.tin[i] <= hi:
                 continue
             items.append((str(i), item.name, "", i))
         return items
@@ -89,6 +245,8 @@ class DENUMUL_props(bpy.types.PropertyGroup):
 
     # parent_enum index
     p_idx: bpy.props.IntProperty(default=-1)
+    # last issued item id
+    uid_counter: bpy.props.IntProperty(default=0, options={"HIDDEN"})
     # parent_enum list
     parent_enum: bpy.props.EnumProperty(
         name="Parent Links",
@@ -121,8 +279,8 @@ class DENUMUL_OT_sub_add(bpy.types.Operator):
         props = scene.denumul_props
         try:
             item = props.subs.add()
-            x = uuid.uuid4()
-            item.uid = str(x)
+            item.uid = uid_new(props)
+            props.cache_reset()
             props.subs_idx = len(props.subs) - 1
         except Exception as my_err:
             self.report({"INFO"}, f"{my_err.args}")
@@ -139,6 +297,8 @@ class DENUMUL_OT_sub_remove(bpy.types.Operator):
 
     # delete item(s) flag: True=All, False=Current
     doall: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
+    # remove the current item's branch flag: True=Item and below, False=Item
+    subtree: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
 
     @classmethod
     def poll(cls, context):
@@ -151,17 +311,28 @@ class DENUMUL_OT_sub_remove(bpy.types.Operator):
         try:
             if self.doall:
                 props.subs.clear()
+                props.cache_reset()
                 props.subs_idx = -1
                 props.p_idx = -1
                 return {"FINISHED"}
             idx = props.subs_idx
-            obj = props.subs[idx]
-            # update parent-reference of any children before removing item
-            for item in props.subs:
-                if item.pid == obj.uid:
-                    item.pid = obj.pid
-            props.subs.remove(idx)
-            props.subs_idx = min(max(0, idx - 1), len(props.subs) - 1)
+            if self.subtree:
+                # the branch is one slice of the Euler tour: no item outside
+                # it points to an item inside it
+                ids = props.subtree(idx)
+            else:
+                # update parent-reference of any children before removing item
+                obj = props.subs[idx]
+                for i in cache_get(props).children.get(idx, ()):
+                    props.subs[i].pid = obj.pid
+                ids = (idx,)
+            # from the end, so that the other indices stay valid
+            for i in sorted(ids, reverse=True):
+                props.subs.remove(i)
+            props.cache_reset()
+            # select the item before the removed one (one parent list rebuild)
+            shift = sum(1 for i in ids if i < idx) + 1
+            props.subs_idx = min(max(0, idx - shift), len(props.subs) - 1)
             # update ui-panel display flag if there are no items left
             if props.subs_idx < 0:
                 props.p_idx = -1
@@ -187,10 +358,19 @@ class DENUMUL_OT_sub_parent(bpy.types.Operator):
         try:
             obj = props.subs[props.subs_idx]
             if not self.val:
-                obj.pid = ""
+                obj.pid = 0
             else:
-                parent = props.subs[int(props.parent_enum)]
+                p = int(props.parent_enum)
+                # the enum only lists valid parents, but it can be out of date
+                # (e.g. after edits from python): a loop would lose the items
+                idx = props.subs_idx
+                if p == idx or props.is_descendant(p, idx):
+                    self.report({"WARNING"}, "cannot parent to a descendant")
+                    return {"CANCELLED"}
+                parent = props.subs[p]
                 obj.pid = parent.uid
+            # the parent-child map is now out of date
+            props.cache_reset()
         except Exception as my_err:
             self.report({"INFO"}, f"{my_err.args}")
             print(f"sub_parent: {my_err.args}")
@@ -214,10 +394,9 @@ class DENUMUL_UL_subs(bpy.types.UIList):
         self.use_filter_show = False
         p_name = ""
         if item.pid:
-            for obj in data.subs:
-                if obj.uid == item.pid:
-                    p_name = obj.name
-                    break
+            i = data.uid_index(item.pid)
+            if i > -1:
+                p_name = data.subs[i].name
         col = layout.column()
         col.prop(item, "name", text="", emboss=False, icon="RADIOBUT_ON")
         col = layout.column()
@@ -241,7 +420,13 @@ class DENUMUL_PT_ui(bpy.types.Panel):
         c = layout.column(align=True)
         row = c.row(align=True)
         row.operator("denumul.sub_add")
-        row.operator("denumul.sub_remove", text="Remove").doall = False
+        # the buttons set both flags: unset ones keep their last used value
+        op = row.operator("denumul.sub_remove", text="Remove")
+        op.doall = False
+        op.subtree = False
+        op = row.operator("denumul.sub_remove", text="Branch")
+        op.doall = False
+        op.subtree = True
         row.operator("denumul.sub_remove", text="Clear").doall = True
         row = c.row(align=True)
 
@@ -293,15 +478,57 @@ classes = (
 )
 
 
+cache_handlers = (
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post,
+)
+
+
+def remove_cache_handlers():
+    for handlers in cache_handlers:
+        for h in [h for h in handlers if h.__name__ == "denumul_cache_clear"]:
+            handlers.remove(h)
+
+
+@persistent
+def denumul_uids_migrate(*args):
+    # files saved with UUID string ids get integer ones (see 'uids_migrate')
+    for scene in getattr(bpy.data, "scenes", ()):
+        n = uids_migrate(scene.denumul_props)
+        if n:
+            print(f"{scene.name}: {n} items converted to integer ids")
+            cache_reset(scene.denumul_props)
+
+
+def remove_migrate_handlers():
+    handlers = bpy.app.handlers.load_post
+    for h in [h for h in handlers if h.__name__ == "denumul_uids_migrate"]:
+        handlers.remove(h)
+
+
 def register():
+    remove_cache_handlers()
+    remove_migrate_handlers()
+
     from bpy.utils import register_class
 
     for cls in classes:
         register_class(cls)
     bpy.types.Scene.denumul_props = bpy.props.PointerProperty(type=DENUMUL_props)
 
+    for handlers in cache_handlers:
+        handlers.append(denumul_cache_clear)
+    bpy.app.handlers.load_post.append(denumul_uids_migrate)
+    # the open file (not available while add-ons load at startup)
+    denumul_uids_migrate()
+
 
 def unregister():
+    remove_cache_handlers()
+    remove_migrate_handlers()
+    denumul_cache_clear()
+
     from bpy.utils import unregister_class
 
     for cls in reversed(classes):
@@ -23,10 +23,41 @@
 
 
 import bpy
-import uuid
-
-from math import radians
-from mathutils import Vector
+import os
+import csv
+import sys
+import hashlib
+import numpy as np
+
+from bpy.app.handlers import persistent
+from collections import OrderedDict, deque
+from functools import wraps
+from itertools import count
+from time import perf_counter
+
+
+def script_dir():
+    # the shared helpers (enum_utils.py, enum_ex3b_kernel.py) are next to this
+    # file. Run from the Text Editor, '__file__' is '<blend file>/<text name>':
+    # the folder is that of the file the text was opened from. An internal
+    # text (not saved to a file) needs the helpers loaded as text blocks too
+    # (see README)
+    text = getattr(bpy.data, "texts", {}).get(os.path.basename(__file__))
+    if text and text.filepath:
+        return os.path.dirname(bpy.path.abspath(text.filepath))
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+sys.path.insert(0, script_dir())
+from enum_utils import enum_cache, ids_read, uid_new, uids_migrate  # noqa: E402
+from enum_ex3b_kernel import (  # noqa: E402
+    Nodes,
+    anim_rotang,
+    frame_value,
+    held_rotang,
+    quat_from_y,
+    quat_to_euler,
+)
 
 
 # *** DEMO REQUIREMENT:
@@ -41,22 +72,263 @@ def req_check(scene):
     return True
 
 
+# ------------------------------------------------------------------------------
+#
+# ------------------------------ LOOKUP CACHE ----------------------------------
+
+# RNA creates a new python wrapper on every access to a PropertyGroup, so the
+# lookup tables cannot live on 'PTDOBRELS_props' itself. They are kept here,
+# keyed by the address of the owning props struct, built on first use and
+# dropped whenever the 'subs' collection or any 'pid' changes (add/remove/
+# parent/undo/file load).
+
+
+class SubsCache:
+    def __init__(self, subs):
+        # index -> uid, and the parent uids (two bulk reads)
+        self.uids, pids = ids_read(subs)
+        # uid -> index
+        self.lookup = dict(zip(self.uids, range(len(self.uids))))
+        # index -> parent index (-1 for root items and missing parents)
+        parents = [self.lookup.get(pid, -1) if pid else -1 for pid in pids]
+        for i, pid in enumerate(pids):
+            if pid and parents[i] < 0:
+                print(f'{subs[i].name} parent id: "{pid}" not found!')
+        # the tree and its array-backed parameters/results (see 'nodes_pull')
+        self.nodes = Nodes(parents)
+        if self.nodes.looped:
+            # parent loops cannot be made from the UI: evaluated as roots
+            print(f"parent loop found in items: {self.nodes.looped}")
+        # the tree queries of the kernel: parent index per item, parent index
+        # -> child indices, evaluation order (parents before children)
+        self.parents = self.nodes.parents
+        self.parents_np = self.nodes.parents_np
+        self.children = self.nodes.children
+        self.order = self.nodes.order
+        # per-item 'rotpiv' flags, read on demand (see 'pivot_flags')
+        self.pivot = None
+        # generation the parameters in 'nodes' were read for (see 'nodes_pull')
+        self.params = None
+        # viewport objects and their last written transforms (see 'display_obs')
+        self.obs = None
+        # evaluated frames, least recently used first (see 'frame_get')
+        self.frames = OrderedDict()
+        self.frames_size = 0
+        # changes with every topology (new cache) or parameter reset
+        self.generation = next(_generations)
+        # digest of what a bake depends on (see 'bake_key')
+        self.bake_key = None
+        # changes with every new cache, i.e. every topology change
+        self.tree = next(_generations)
+        # renames counter (see 'PTDOBRELS_sub.name_update')
+        self.names = 0
+
+
+_caches = {}
+_generations = count()
+
+
+def cache_get(props):
+    key = props.as_pointer()
+    cache = _caches.get(key)
+    # the length check catches collection changes made outside our operators
+    if cache is None or len(cache.uids) != len(props.subs):
+        cache = _caches[key] = SubsCache(props.subs)
+    return cache
+
+
+def cache_reset(props):
+    _caches.pop(props.as_pointer(), None)
+
+
+def params_reset(props):
+    # call from: 'OT_sub' (item values changed, topology did not)
+
+    cache = _caches.get(props.as_pointer())
+    if cache:
+        cache.pivot = None
+        cache.bake_key = None
+        cache.generation = next(_generations)
+        frames_trim(cache, 0)
+
+
+# ---- FRAME CACHE
+
+# 'fcpre' results are kept per (frame value, generation) as float32 arrays
+# (rotang, loc, rot, ploc, prot), within the 'frame_cache_mb' budget.
+
+
+def frame_get(cache, key):
+    arrs = cache.frames.get(key)
+    if arrs is not None:
+        cache.frames.move_to_end(key)
+    return arrs
+
+
+def frame_put(cache, key, arrs, budget):
+    size = sum(a.nbytes for a in arrs)
+    if size > budget:
+        return
+    cache.frames[key] = arrs
+    cache.frames_size += size
+    frames_trim(cache, budget)
+
+
+def frames_trim(cache, budget):
+    # evict least recently used frames until the cache fits 'budget' bytes
+    while cache.frames and cache.frames_size > budget:
+        key, arrs = cache.frames.popitem(last=False)
+        cache.frames_size -= sum(a.nbytes for a in arrs)
+    if not cache.frames:
+        cache.frames_size = 0
+
+
+@persistent
+def ptdobrels_cache_clear(*args):
+    # call from: undo/redo/load_post handlers (RNA may have been re-allocated)
+
+    _caches.clear()
+    _shown.clear()
+    _bakes.clear()
+    PTDOBRELS_props.parent_enum_items.cache_clear()
+
+
+def parent_enum_key(props, context):
+    # call from: 'parent_enum_items' (enum_cache)
+
+    cache = cache_get(props)
+    return (props.as_pointer(), cache.tree, cache.names, props.subs_idx)
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------- PROFILING ------------------------------------
+
+# Opt-in timing of the hot paths (sub-panel 'Profile'). The functions of each
+# stage are wrapped with 'profiled': while profiling is off the wrapper only
+# checks a flag, while it is on every call adds a (start, ms) record to the
+# ring buffer of its stage. Times are inclusive: 'scene_update' contains the
+# 'update_sub'/'update_subs_batch' and 'update_sub_obs' calls it makes.
+# Each stage keeps its own buffer, so the one call per item of 'update_sub'
+# does not push the records of the other stages out.
+
+PROFILE_SIZE = 1000
+PROFILE_STAGES = (
+    "fcpre",
+    "scene_update",
+    "update_sub",
+    "update_subs_batch",
+    "update_sub_obs",
+    "parent_enum_items",
+    "draw",
+)
+
+
+class Profile:
+    def __init__(self):
+        self.on = False
+        self.reset()
+
+    def reset(self):
+        self.start = perf_counter()
+        self.calls = dict.fromkeys(PROFILE_STAGES, 0)
+        self.records = {s: deque(maxlen=PROFILE_SIZE) for s in PROFILE_STAGES}
+
+    def add(self, stage, t, ms):
+        self.calls[stage] += 1
+        self.records[stage].append((t - self.start, ms))
+
+    def stats(self):
+        # stage -> (calls, last, avg, p95) in ms, for the stages with records
+        res = {}
+        for stage, recs in self.records.items():
+            if recs:
+                ms = np.array([r[1] for r in recs])
+                res[stage] = (
+                    self.calls[stage],
+                    ms[-1],
+                    ms.mean(),
+                    np.percentile(ms, 95),
+                )
+        return res
+
+    def csv_write(self, path):
+        # all records, oldest first; returns their number
+        rows = sorted(
+            (t, stage, ms) for stage, recs in self.records.items() for t, ms in recs
+        )
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(("time_s", "stage", "ms"))
+            for t, stage, ms in rows:
+                w.writerow((f"{t:.6f}", stage, f"{ms:.4f}"))
+        return len(rows)
+
+
+_profile = Profile()
+
+
+def profiled(stage, callback=False):
+    # decorator: time the calls of a hot path function as 'stage'
+    # 'callback': a (self, context) function called by Blender ('items', 'draw'),
+    # which checks the number of arguments when the class is registered
+
+    def decorator(func):
+        def timed_call(*args, **kwargs):
+            if not _profile.on:
+                return func(*args, **kwargs)
+            t = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _profile.add(stage, t, (perf_counter() - t) * 1000)
+
+        if callback:
+
+            @wraps(func)
+            def wrapper(self, context):
+                return timed_call(self, context)
+
+        else:
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return timed_call(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 # ------------------------------------------------------------------------------
 #
 # ----------------------------- PROPERTIES -------------------------------------
 
+# above this number of items the add operators switch to the shared display
+# (see DISPLAY SWITCH)
+SHARED_DISPLAY_MIN = 1000
+
 
 class PTDOBRELS_sub(bpy.types.PropertyGroup):
     def object_color_update(self, context):
         if self.pnt_ob:
             self.pnt_ob.color = self.object_color
+        else:
+            instancer_attr_set(self, "color", self.object_color)
 
     def object_scale_update(self, context):
         if self.pnt_ob:
             v = self.object_scale
             self.pnt_ob.scale = (v, v, v)
+        else:
+            instancer_attr_set(self, "value", self.object_scale)
 
-    name: bpy.props.StringProperty(default="sub")
+    def name_update(self, context):
+        cache = _caches.get(self.id_data.ptdobrels_props.as_pointer())
+        if cache:
+            cache.names += 1
+
+    name: bpy.props.StringProperty(default="sub", update=name_update)
     # viewport objects
     pnt_ob: bpy.props.PointerProperty(type=bpy.types.Object)
     object_color: bpy.props.FloatVectorProperty(
@@ -78,9 +350,11 @@ class PTDOBRELS_sub(bpy.types.PropertyGroup):
         options={"HIDDEN"},
     )
     vec_ob: bpy.props.PointerProperty(type=bpy.types.Object)
-    # ids
-    uid: bpy.props.StringProperty(default="")
-    pid: bpy.props.StringProperty(default="")
+    # batch edits (see 'selected_ids')
+    select: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
+    # ids (see 'uid_new'), pid 0: no parent
+    uid: bpy.props.IntProperty(default=0)
+    pid: bpy.props.IntProperty(default=0)
     # parent loc/rot
     ploc: bpy.props.FloatVectorProperty(
         size=3, default=[0, 0, 0], subtype="TRANSLATION"
@@ -88,8 +362,6 @@ class PTDOBRELS_sub(bpy.types.PropertyGroup):
     prot: bpy.props.FloatVectorProperty(
         size=4, default=[1, 0, 0, 0], subtype="QUATERNION"
     )
-    # calculations flag
-    complete: bpy.props.BoolProperty(default=False)
     # location/rotation
     loc: bpy.props.FloatVectorProperty(size=3, default=[0, 0, 0], subtype="TRANSLATION")
     rot: bpy.props.FloatVectorProperty(
@@ -105,23 +377,40 @@ class PTDOBRELS_sub(bpy.types.PropertyGroup):
 
 
 class PTDOBRELS_props(bpy.types.PropertyGroup):
-    def descendants(self, key, lst=[]):
-        cids = [ob.uid for ob in self.subs if ob.pid == key]
-        for cid in cids:
-            lst.append(cid)
-            # recursion
-            lst = self.descendants(cid, lst)
-        return lst
+    def uid_index(self, uid):
+        # index of the item with uid==uid, -1 if not found
+        return cache_get(self).lookup.get(uid, -1)
+
+    def index_uid(self, idx):
+        return cache_get(self).uids[idx]
+
+    def cache_reset(self):
+        cache_reset(self)
 
+    def params_reset(self):
+        params_reset(self)
+
+    def subtree(self, idx):
+        # item 'idx' followed by all items below it, parents before children
+        return cache_get(self).nodes.subtree(idx)
+
+    def descendants(self, idx):
+        # set of indices of all items below item 'idx'
+        return cache_get(self).nodes.descendants(idx)
+
+    # called on every redraw: the same items are returned until the
+    # selection, the tree or a name changes (this also keeps the item
+    # strings alive, as dynamic enums require)
+    @profiled("parent_enum_items", callback=True)
+    @enum_cache(key=parent_enum_key)
     def parent_enum_items(self, context):
         items = []
         if not bool(self.subs):
             return items
         idx = self.subs_idx
-        key = self.subs[idx].uid
-        dids = self.descendants(key, [])
+        dids = self.descendants(idx)
         for i, item in enumerate(self.subs):
-            if (i == idx) or (item.uid in dids):
+            if (i == idx) or (i in dids):
                 continue
             items.append((str(i), item.name, "", i))
         return items
@@ -129,6 +418,35 @@ class PTDOBRELS_props(bpy.types.PropertyGroup):
     def parent_enum_update(self, context):
         self.p_idx = self.get("parent_enum", -1)
 
+    def pnt_display_update(self, context):
+        # swap the point objects for the instancer or vice versa
+        scene = self.id_data
+        obs_remove([item.pnt_ob for item in self.subs if item.pnt_ob])
+        if self.pnt_display == "OBJECTS":
+            instancer_remove()
+            for item in self.subs:
+                pnt_ob_new(scene, item)
+                item.object_color_update(context)
+                item.object_scale_update(context)
+        cache_reset(self)
+        scene_update(scene)
+
+    def vec_display_update(self, context):
+        # swap the vector objects for the shared mesh or vice versa
+        scene = self.id_data
+        obs_remove([item.vec_ob for item in self.subs if item.vec_ob])
+        if self.vec_display == "OBJECTS":
+            vectors_remove()
+            for item in self.subs:
+                vec_ob_new(scene, item, item.pnt_ob.name if item.pnt_ob else "obj")
+        cache_reset(self)
+        scene_update(scene)
+
+    def frame_cache_update(self, context):
+        cache = _caches.get(self.as_pointer())
+        if cache:
+            frames_trim(cache, self.frame_cache_mb * 2**20)
+
     def subs_idx_update(self, context):
         self.p_idx = -1
         if bool(self.subs):
@@ -137,6 +455,81 @@ class PTDOBRELS_props(bpy.types.PropertyGroup):
                 self.parent_enum = items[0][0]
 
     p_idx: bpy.props.IntProperty(default=-1)
+    # last issued item id (see 'uid_new')
+    uid_counter: bpy.props.IntProperty(default=0, options={"HIDDEN"})
+    batch_count: bpy.props.IntProperty(
+        name="Count",
+        description="number of sub systems to add",
+        default=10,
+        min=1,
+        max=10000,
+        options={"HIDDEN"},
+    )
+    engine: bpy.props.EnumProperty(
+        name="Engine",
+        description="scene evaluation engine",
+        items=(
+            ("MATHUTILS", "mathutils", "evaluate one item at a time"),
+            ("NUMPY", "numpy", "evaluate each tree level as one batch"),
+        ),
+        default="NUMPY",
+        options={"HIDDEN"},
+    )
+    pnt_display: bpy.props.EnumProperty(
+        name="Points",
+        description="viewport display of the point markers",
+        items=(
+            ("OBJECTS", "Objects", "one copy of 'pob' per item"),
+            ("INSTANCES", "Instances", "one object instancing 'pob' on a point cloud"),
+        ),
+        default="OBJECTS",
+        update=pnt_display_update,
+        options={"HIDDEN"},
+    )
+    vec_display: bpy.props.EnumProperty(
+        name="Vectors",
+        description="viewport display of the parent-child vectors",
+        items=(
+            ("OBJECTS", "Objects", "one copy of 'vob' per item"),
+            ("MESH", "Mesh", "one edge per item in a shared mesh"),
+        ),
+        default="OBJECTS",
+        update=vec_display_update,
+        options={"HIDDEN"},
+    )
+    display_auto: bpy.props.BoolProperty(
+        name="Auto",
+        description=f"above {SHARED_DISPLAY_MIN} sub systems, show points as "
+        "instances and vectors as a shared mesh (one object each)",
+        default=True,
+        options={"HIDDEN"},
+    )
+    subs_max: bpy.props.IntProperty(
+        name="Max Subs",
+        description="limit for the number of sub systems",
+        default=10000,
+        min=1,
+        max=100000,
+        options={"HIDDEN"},
+    )
+    use_bake: bpy.props.BoolProperty(
+        name="Play Bake",
+        description="read animated frames from the bake file while it is valid",
+        default=False,
+        options={"HIDDEN"},
+    )
+    bake_key: bpy.props.StringProperty(default="", options={"HIDDEN"})
+    bake_start: bpy.props.IntProperty(default=1, options={"HIDDEN"})
+    bake_end: bpy.props.IntProperty(default=0, options={"HIDDEN"})
+    frame_cache_mb: bpy.props.IntProperty(
+        name="Frame Cache (MB)",
+        description="memory for evaluated animation frames, 0 to disable",
+        default=64,
+        min=0,
+        max=4096,
+        update=frame_cache_update,
+        options={"HIDDEN"},
+    )
     parent_enum: bpy.props.EnumProperty(
         name="Parent Links",
         description="parent",
@@ -155,30 +548,191 @@ class PTDOBRELS_props(bpy.types.PropertyGroup):
 # --------------------- OBJECT RELATIONS FUNCTIONS -----------------------------
 
 
-def update_sub_obs(item):
-    # call from: 'update_sub'
+def pnt_ob_new(scene, item):
+    # call from: 'OT_sub_add', 'pnt_display_update'
 
-    loc = item.loc
-    ob = item.pnt_ob
-    if ob:
-        ob.hide_viewport = False
-        ob.location = loc
-        ob.rotation_mode = "XYZ"
-        ob.rotation_euler = item.rot.to_euler()
-    else:
-        print(f"{item.name} point object is missing!")
-
-    ob = item.vec_ob
-    if ob:
-        ob.hide_viewport = False
-        ob.location = item.ploc
-        vdir = loc - item.ploc
-        vrot = Vector((0, 1, 0)).rotation_difference(vdir)
-        ob.rotation_mode = "XYZ"
-        ob.rotation_euler = vrot.to_euler()
-        ob.scale[1] = vdir.length
+    coll = scene.collection.children["base_objects"]
+    ob = coll.objects["pob"].copy()
+    ob.name = "obj"
+    ob.location = (0, 0, 0)
+    ob.hide_viewport = False
+    scene.collection.objects.link(ob)
+    item.pnt_ob = ob
+    return ob
+
+
+def vec_ob_new(scene, item, name):
+    # call from: 'OT_sub_add', 'vec_display_update'
+
+    coll = scene.collection.children["base_objects"]
+    ob = coll.objects["vob"].copy()
+    ob.name = f"{name}_vec"
+    ob.scale[1] = 0.01
+    ob.hide_viewport = False
+    scene.collection.objects.link(ob)
+    item.vec_ob = ob
+    return ob
+
+
+def obs_remove(obs, extra=()):
+    # call from: 'temps_remove', 'pnt_display_update', 'vec_display_update'
+
+    # remove objects 'obs', the meshes only they use and the IDs 'extra' with
+    # one 'batch_remove' (each 'objects.remove' call walks all ID users)
+    meshes = {}
+    for ob in obs:
+        me = ob.data
+        if me is not None:
+            key = me.as_pointer()
+            meshes[key] = (me, meshes.get(key, (me, 0))[1] + 1)
+    orphans = [me for me, n in meshes.values() if me.users <= n]
+    ids = [*obs, *orphans, *extra]
+    if ids:
+        bpy.data.batch_remove(ids)
+    return len(ids)
+
+
+def temps_remove(items, shared=False):
+    # call from: 'OT_sub_remove', 'subs_remove'
+
+    # remove the viewport objects of 'items' ('shared': also the instancer
+    # and the vector mesh, when no item is left)
+    obs = [ob for item in items for ob in (item.pnt_ob, item.vec_ob) if ob]
+    extra = instancer_ids() + vectors_ids() if shared else ()
+    return obs_remove(obs, extra)
+
+
+# The last written display outlives the lookup cache: a topology change (add,
+# remove, reparent) builds a new cache, but the objects of the items that are
+# kept still show the transforms written before it. Per props:
+#
+#   (uids, object pointers (n, 2), pnt_shown, vec_shown, instanced, meshed)
+#
+# the arrays are those of the cache that wrote them ('display_obs'), so they
+# are always current. Dropped on undo/load, like the caches.
+
+_shown = {}
+
+
+def display_obs(props, cache):
+    # call from: 'update_sub_obs'
+
+    # read the viewport objects once per cache. New objects are switched to
+    # quaternion rotation (no euler conversion per write) and marked as not
+    # yet written; the objects of kept items keep their last written rows
+    if cache.obs is None:
+        instanced = props.pnt_display == "INSTANCES"
+        meshed = props.vec_display == "MESH"
+        n = len(props.subs)
+        cache.obs = [(None, None)] * n
+        ptrs = np.zeros((n, 2), dtype=np.uint64)
+        # both displays shared: the items have no objects to read
+        for i, item in enumerate(() if instanced and meshed else props.subs):
+            pair = cache.obs[i] = (item.pnt_ob, item.vec_ob)
+            for k, kind in enumerate(("point", "vector")):
+                if pair[k]:
+                    ptrs[i, k] = pair[k].as_pointer()
+                elif not (instanced and kind == "point" or meshed and kind == "vector"):
+                    print(f"{item.name} {kind} object is missing!")
+        # point: loc, rot / vector: loc, rot, length (mesh: ploc, loc)
+        cache.pnt_shown = np.full((n, 7), np.nan, dtype=np.float32)
+        cache.vec_shown = np.full((n, 6 if meshed else 8), np.nan, dtype=np.float32)
+        # rows of the kept objects: same item (uid), same object, same mode
+        key = props.as_pointer()
+        prev = _shown.get(key)
+        same = np.zeros((n, 2), dtype=bool)
+        if prev is not None:
+            uids, old_ptrs, old_pnt, old_vec, old_instanced, old_meshed = prev
+            pos = dict(zip(uids, range(len(uids))))
+            rows = np.array([pos.get(uid, -1) for uid in cache.uids], dtype=np.int64)
+            kept = rows > -1
+            same[kept] = ptrs[kept] == old_ptrs[rows[kept]]
+            for k, shown, old, mode in (
+                (0, cache.pnt_shown, old_pnt, old_instanced == instanced),
+                (1, cache.vec_shown, old_vec, old_meshed == meshed),
+            ):
+                if mode:
+                    shown[same[:, k]] = old[rows[same[:, k]]]
+                else:
+                    same[:, k] = False
+        for i, k in zip(*np.nonzero(~same & (ptrs > 0))):
+            ob = cache.obs[i][k]
+            # each write is an RNA update: only where it is not set yet
+            if ob.hide_viewport:
+                ob.hide_viewport = False
+            if ob.rotation_mode != "QUATERNION":
+                ob.rotation_mode = "QUATERNION"
+        _shown[key] = (
+            list(cache.uids),
+            ptrs,
+            cache.pnt_shown,
+            cache.vec_shown,
+            instanced,
+            meshed,
+        )
+        # the shared objects are written as a whole: start from the last
+        # evaluated transforms (a subtree update only changes some rows)
+        subs = props.subs
+        loc = subs_get(subs, "loc", 3)
+        if instanced:
+            cache.pnt_shown[:] = np.hstack((loc, subs_get(subs, "rot", 4)))
+            instancer_sync(props)
+            instancer_update(props, cache.pnt_shown)
+        if meshed:
+            cache.vec_shown[:] = np.hstack((subs_get(subs, "ploc", 3), loc))
+            vectors_sync(props)
+            vectors_update(props, cache.vec_shown)
+    return cache.obs
+
+
+@profiled("update_sub_obs")
+def update_sub_obs(props, ids, loc, rot, ploc):
+    # call from: 'update_subs', 'update_subs_batch'
+
+    # display sync for items 'ids' (rows of loc/rot/ploc): transforms for all
+    # of them are computed in one batch, objects are written only if their
+    # transform differs from the last one written
+    cache = cache_get(props)
+    obs = display_obs(props, cache)
+    meshed = props.vec_display == "MESH"
+    pnt = np.hstack((loc, rot)).astype(np.float32)
+    if meshed:
+        vec = np.hstack((ploc, loc))
     else:
-        print(f"{item.name} vector object is missing!")
+        vdir = loc - ploc
+        vlen = np.linalg.norm(vdir, axis=1)[:, None]
+        vec = np.hstack((ploc, quat_from_y(vdir), vlen))
+    vec = vec.astype(np.float32)
+    pnt_new = np.any(pnt != cache.pnt_shown[ids], axis=1)
+    vec_new = np.any(vec != cache.vec_shown[ids], axis=1)
+    cache.pnt_shown[ids] = pnt
+    cache.vec_shown[ids] = vec
+    try:
+        if props.pnt_display == "INSTANCES":
+            # one mesh write for all points
+            if pnt_new.any():
+                instancer_update(props, cache.pnt_shown)
+            pnt_new[:] = False
+        if meshed:
+            # one mesh write for all vectors
+            if vec_new.any():
+                vectors_update(props, cache.vec_shown)
+            vec_new[:] = False
+        for k in np.flatnonzero(pnt_new):
+            ob = obs[ids[k]][0]
+            if ob:
+                ob.location = pnt[k, :3]
+                ob.rotation_quaternion = pnt[k, 3:]
+        for k in np.flatnonzero(vec_new):
+            ob = obs[ids[k]][1]
+            if ob:
+                ob.location = vec[k, :3]
+                ob.rotation_quaternion = vec[k, 3:7]
+                ob.scale[1] = vec[k, 7]
+    except ReferenceError:
+        # an object was deleted outside the add-on: re-read them next time
+        cache_reset(props)
+        _shown.pop(props.as_pointer(), None)
 
 
 def finalize_sub(item):
@@ -191,72 +745,655 @@ def finalize_sub(item):
     return loc, rot
 
 
-def update_sub(props, item):
-    # call from: 'scene_update'
+@profiled("update_sub")
+def update_sub(item, p):
+    # call from: 'update_subs'
 
-    if item.complete:
-        return
-    if item.pid:
-        p = None
-        for i, pnt in enumerate(props.subs):
-            if pnt.uid == item.pid:
-                p = props.subs[i]
-                break
-        if p:
-            if not p.complete:
-                # *** recursion call ***#
-                update_sub(props, p)
-            # parent influence
-            item.ploc = p.loc
-            item.prot = p.rot if item.rotinf else (1, 0, 0, 0)
-        else:
-            print(f'{item.name} parent id: "{item.pid}" not found!')
-            item.ploc = (0, 0, 0)
-            item.prot = (1, 0, 0, 0)
+    if p:
+        # parent influence
+        item.ploc = p.loc
+        item.prot = p.rot if item.rotinf else (1, 0, 0, 0)
     else:
         item.ploc = (0, 0, 0)
         item.prot = (1, 0, 0, 0)
-    item.loc, item.rot = finalize_sub(item)
+    loc, rot = finalize_sub(item)
+    item.loc, item.rot = loc, rot
+    return loc, rot, item.ploc
+
+
+def update_subs(props, order=None):
+    # call from: 'scene_update', 'scene_update_frames'
+
+    # the cached order puts parents before children: one flat pass
+    cache = cache_get(props)
+    if props.engine == "NUMPY":
+        update_subs_batch(props, cache, order)
+        return
+    if order is None:
+        order = cache.order
+    if not order:
+        return
+    subs = props.subs
+    res = []
+    for i in order:
+        j = cache.parents[i]
+        res.append(update_sub(subs[i], subs[j] if j > -1 else None))
     # update display
-    update_sub_obs(item)
-    item.complete = True
+    loc, rot, ploc = (np.array(v, dtype=np.float64) for v in zip(*res))
+    update_sub_obs(props, np.array(order), loc, rot, ploc)
 
 
-def scene_update(scene):
+@profiled("scene_update")
+def scene_update(scene, idx=-1):
     # call from: 'OT_sub_remove', 'OT_sub_parent', 'OT_sub'
 
     props = scene.ptdobrels_props
-    # init state parameter
-    for item in props.subs:
-        item.complete = False
-    # update objects
-    for item in props.subs:
-        if item.complete:
-            continue
-        update_sub(props, item)
+    # an edit to item 'idx' (values or parent) can only affect its subtree:
+    # every other item keeps its last evaluated loc/rot
+    order = props.subtree(idx) if idx > -1 else None
+    update_subs(props, order)
 
 
 def scene_update_frames(scene, val):
     props = scene.ptdobrels_props
     if not bool(props.subs):
         return
-    # init state parameter and anim values
-    if not val:
-        for item in props.subs:
-            item.complete = False
-            item.rotang = (0, 0, 0)
+    subs = props.subs
+    cache = cache_get(props)
+    if cache.params == cache.generation:
+        # the values of the last frame, no RNA reads
+        rotang = cache.nodes.rotang
+        tilt = cache.nodes.iloc[:, 2] != 0
     else:
-        for i, item in enumerate(props.subs):
-            item.complete = False
-            if item.iloc[2]:
-                item.rotang[1] = (i + 1) * val
-            else:
-                item.rotang[2] = (i + 1) * val
+        rotang = subs_get(subs, "rotang", 3)
+        tilt = subs_get(subs, "iloc", 3)[:, 2] != 0
+    if not val:
+        # the angles that are not animated keep their edited values until
+        # they are reset here, so frames cached before this are out of date
+        if held_rotang(rotang, tilt).any():
+            params_reset(props)
+    # cached frame
+    key = (val, cache.generation)
+    budget = props.frame_cache_mb * 2**20
+    arrs = frame_get(cache, key) if budget else None
+    if arrs is not None:
+        frame_apply(props, arrs)
+        return
+    # anim values
+    rotang = anim_rotang(rotang, tilt, val)
+    subs_set(subs, "rotang", rotang)
+    if cache.params == cache.generation:
+        cache.nodes.rotang = rotang
     # update objects
-    for item in props.subs:
-        if item.complete:
+    update_subs(props)
+    if budget:
+        if props.engine == "NUMPY":
+            # the results are still in the nodes (as written to the items)
+            res = [getattr(cache.nodes, a) for a, size in FRAME_FIELDS[1:]]
+            arrs = [rotang] + [a.astype(np.float32) for a in res]
+        else:
+            arrs = [rotang]
+            arrs += [subs_get(subs, a, size) for a, size in FRAME_FIELDS[1:]]
+        frame_put(cache, key, arrs, budget)
+
+
+# per-frame results, in frame cache and bake order
+FRAME_FIELDS = (("rotang", 3), ("loc", 3), ("rot", 4), ("ploc", 3), ("prot", 4))
+
+
+def frame_apply(props, arrs):
+    # call from: 'scene_update_frames', 'bake_update'
+
+    # write one evaluated frame (FRAME_FIELDS arrays) and sync the display
+    subs = props.subs
+    for (attr, size), values in zip(FRAME_FIELDS, arrs):
+        subs_set(subs, attr, values)
+    # 'rotang' of the nodes is out of date
+    cache_get(props).params = None
+    n = len(subs)
+    loc, rot, ploc = (np.reshape(arrs[k], (n, -1)) for k in (1, 2, 3))
+    update_sub_obs(props, np.arange(n), loc, rot, ploc)
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------- BULK I/O -------------------------------------
+
+# One foreach_get/foreach_set call moves a property of every item in 'subs'
+# through a contiguous buffer, instead of one RNA round trip per item.
+
+
+def subs_get(subs, attr, size, dtype=np.float32):
+    buf = np.empty(len(subs) * size, dtype=dtype)
+    subs.foreach_get(attr, buf)
+    return buf.reshape(-1, size) if size > 1 else buf
+
+
+def subs_set(subs, attr, values, dtype=np.float32):
+    subs.foreach_set(attr, np.ascontiguousarray(values, dtype=dtype).ravel())
+
+
+def pivot_flags(props, cache):
+    # 'rotpiv' is a string property (no foreach access), so it is read per
+    # item only after the cache was reset or an item was edited
+    if cache.pivot is None:
+        cache.pivot = np.array(
+            [item.rotpiv == "parent" for item in props.subs], dtype=bool
+        )
+    return cache.pivot
+
+
+# ------------------------------------------------------------------------------
+#
+# ---------------------------- KERNEL ADAPTER ----------------------------------
+
+# The batch engine runs on the array-backed 'Nodes' of the lookup cache
+# (enum_ex3b_kernel.py). RNA is touched only here: one bulk read of the item
+# parameters before the evaluation, one bulk write of the results after it.
+
+
+def nodes_pull(props, cache, results=False):
+    # call from: 'update_subs_batch', 'bake_frames'
+
+    # item parameters -> 'cache.nodes' ('results': also the last evaluated
+    # values, which a subtree evaluation leaves as they are for other items).
+    # The parameters are read once per generation: edits bump it (see
+    # 'params_reset') and an animated frame keeps 'rotang' of the nodes current
+    subs = props.subs
+    nodes = cache.nodes
+    if cache.params != cache.generation:
+        nodes.iloc = subs_get(subs, "iloc", 3)
+        nodes.rotang = subs_get(subs, "rotang", 3)
+        nodes.inherit = subs_get(subs, "rotinf", 1, bool)
+        nodes.pivot = pivot_flags(props, cache)
+        cache.params = cache.generation
+    if results:
+        for attr, size in FRAME_FIELDS[1:]:
+            setattr(nodes, attr, subs_get(subs, attr, size))
+    return nodes
+
+
+def nodes_push(props, nodes, ids):
+    # call from: 'update_subs_batch'
+
+    # evaluated values -> items, then display sync for the items 'ids'
+    subs = props.subs
+    for attr, size in FRAME_FIELDS[1:]:
+        subs_set(subs, attr, getattr(nodes, attr))
+    update_sub_obs(props, ids, nodes.loc[ids], nodes.rot[ids], nodes.ploc[ids])
+
+
+@profiled("update_subs_batch")
+def update_subs_batch(props, cache, order=None):
+    # call from: 'update_subs'
+
+    # 'order': subtree update, the other items keep their evaluated values.
+    # The bulk reads/writes still cover all items (one C loop each), the
+    # math and the display updates only the subtree
+    if order is not None and not order:
+        return
+    nodes = nodes_pull(props, cache, results=order is not None)
+    ids = nodes.evaluate(order)
+    nodes_push(props, nodes, ids)
+
+
+# ------------------------------------------------------------------------------
+#
+# -------------------------- INSTANCED DISPLAY ---------------------------------
+
+# 'pnt_display' INSTANCES: all point markers are drawn by one object, a mesh
+# with one vertex per item (location + "rot", "scale" and "color" point
+# attributes) and a geometry nodes modifier that instances the "pob" mesh on
+# its points. Per-item colors are read by the material (instancer attribute)
+# and show in Material Preview/Rendered shading.
+
+INSTANCER = "rels_points"
+
+
+def instancer_nodes(pob, mat):
+    # call from: 'instancer_get'
+
+    ng = bpy.data.node_groups.new(INSTANCER, "GeometryNodeTree")
+    if hasattr(ng, "interface"):
+        # blender 4.0+
+        for io in ("INPUT", "OUTPUT"):
+            ng.interface.new_socket(
+                "Geometry", in_out=io, socket_type="NodeSocketGeometry"
+            )
+    else:
+        ng.inputs.new("NodeSocketGeometry", "Geometry")
+        ng.outputs.new("NodeSocketGeometry", "Geometry")
+    nodes = ng.nodes
+    gin = nodes.new("NodeGroupInput")
+    gout = nodes.new("NodeGroupOutput")
+    info = nodes.new("GeometryNodeObjectInfo")
+    info.inputs["Object"].default_value = pob
+    setmat = nodes.new("GeometryNodeSetMaterial")
+    setmat.inputs["Material"].default_value = mat
+    inst = nodes.new("GeometryNodeInstanceOnPoints")
+    links = ng.links
+    links.new(gin.outputs[0], inst.inputs["Points"])
+    links.new(info.outputs["Geometry"], setmat.inputs["Geometry"])
+    links.new(setmat.outputs["Geometry"], inst.inputs["Instance"])
+    for name, data_type, socket in (
+        ("rot", "FLOAT_VECTOR", "Rotation"),
+        ("scale", "FLOAT", "Scale"),
+    ):
+        attr = nodes.new("GeometryNodeInputNamedAttribute")
+        attr.data_type = data_type
+        attr.inputs["Name"].default_value = name
+        # one output per data type, only the selected one is enabled
+        out = next(s for s in attr.outputs if s.enabled)
+        links.new(out, inst.inputs[socket])
+    links.new(inst.outputs["Instances"], gout.inputs[0])
+    return ng
+
+
+def instancer_material():
+    # call from: 'instancer_get'
+
+    mat = bpy.data.materials.new(INSTANCER)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    attr = nodes.new("ShaderNodeAttribute")
+    attr.attribute_type = "INSTANCER"
+    attr.attribute_name = "color"
+    bsdf = next(n for n in nodes if n.type == "BSDF_PRINCIPLED")
+    mat.node_tree.links.new(attr.outputs["Color"], bsdf.inputs["Base Color"])
+    return mat
+
+
+def instancer_get(scene, create=True):
+    # call from: 'instancer_sync', 'instancer_update', 'instancer_attr_set'
+
+    ob = bpy.data.objects.get(INSTANCER)
+    if ob or not create:
+        return ob
+    me = bpy.data.meshes.new(INSTANCER)
+    ob = bpy.data.objects.new(INSTANCER, me)
+    scene.collection.objects.link(ob)
+    pob = scene.collection.children["base_objects"].objects["pob"]
+    mod = ob.modifiers.new(INSTANCER, "NODES")
+    mod.node_group = instancer_nodes(pob, instancer_material())
+    return ob
+
+
+def instancer_ids():
+    # call from: 'instancer_remove', 'temps_remove'
+
+    # the instancer object and the data only it uses
+    ob = bpy.data.objects.get(INSTANCER)
+    if not ob:
+        return []
+    mod = ob.modifiers.get(INSTANCER)
+    ids = [ob, ob.data]
+    if mod and mod.node_group:
+        ids.append(mod.node_group)
+    mat = bpy.data.materials.get(INSTANCER)
+    if mat:
+        ids.append(mat)
+    return ids
+
+
+def instancer_remove():
+    # call from: 'pnt_display_update'
+
+    ids = instancer_ids()
+    if ids:
+        bpy.data.batch_remove(ids)
+
+
+def instancer_sync(props):
+    # call from: 'display_obs'
+
+    # one vertex per item, colors and scales read in bulk
+    me = instancer_get(props.id_data).data
+    n = len(props.subs)
+    if len(me.vertices) != n:
+        me.clear_geometry()
+        me.vertices.add(n)
+    attrs = me.attributes
+    for name, data_type in (
+        ("rot", "FLOAT_VECTOR"),
+        ("scale", "FLOAT"),
+        ("color", "FLOAT_COLOR"),
+    ):
+        if attrs.get(name) is None:
+            attrs.new(name, data_type, "POINT")
+    scale = subs_get(props.subs, "object_scale", 1)
+    attrs["scale"].data.foreach_set("value", scale)
+    color = subs_get(props.subs, "object_color", 4)
+    attrs["color"].data.foreach_set("color", color.ravel())
+    me.update()
+
+
+def instancer_update(props, pnt):
+    # call from: 'update_sub_obs'
+
+    # pnt: loc (3) + rot (4) rows of all items
+    me = instancer_get(props.id_data).data
+    me.vertices.foreach_set("co", np.ascontiguousarray(pnt[:, :3]).ravel())
+    rot = quat_to_euler(pnt[:, 3:].astype(np.float64)).astype(np.float32)
+    me.attributes["rot"].data.foreach_set("vector", rot.ravel())
+    me.update()
+
+
+def instancer_attr_set(item, key, value):
+    # call from: 'PTDOBRELS_sub' color/scale updates
+
+    props = item.id_data.ptdobrels_props
+    if props.pnt_display != "INSTANCES":
+        return
+    ob = instancer_get(props.id_data, create=False)
+    i = props.uid_index(item.uid)
+    name = "scale" if key == "value" else key
+    attr = ob.data.attributes.get(name) if ob else None
+    if attr and -1 < i < len(attr.data):
+        setattr(attr.data[i], key, value)
+        ob.data.update()
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------- VECTOR MESH DISPLAY --------------------------------
+
+# 'vec_display' MESH: all parent-child vectors are edges of one mesh, two
+# vertices (parent location, location) and one edge per item, so a display
+# update is one 'foreach_set' of the vertex coordinates.
+
+VECTORS = "rels_vectors"
+
+
+def vectors_get(scene, create=True):
+    # call from: 'vectors_sync', 'vectors_update'
+
+    ob = bpy.data.objects.get(VECTORS)
+    if ob or not create:
+        return ob
+    me = bpy.data.meshes.new(VECTORS)
+    ob = bpy.data.objects.new(VECTORS, me)
+    scene.collection.objects.link(ob)
+    return ob
+
+
+def vectors_ids():
+    # call from: 'vectors_remove', 'temps_remove'
+
+    ob = bpy.data.objects.get(VECTORS)
+    return [ob, ob.data] if ob else []
+
+
+def vectors_remove():
+    # call from: 'vec_display_update'
+
+    ids = vectors_ids()
+    if ids:
+        bpy.data.batch_remove(ids)
+
+
+def vectors_sync(props):
+    # call from: 'display_obs'
+
+    # edge i joins vertices 2i (parent location) and 2i+1 (location)
+    me = vectors_get(props.id_data).data
+    n = len(props.subs)
+    if len(me.edges) != n:
+        me.clear_geometry()
+        me.vertices.add(n * 2)
+        me.edges.add(n)
+        me.edges.foreach_set("vertices", np.arange(n * 2, dtype=np.int32))
+        me.update()
+
+
+def vectors_update(props, vec):
+    # call from: 'update_sub_obs'
+
+    # vec: ploc (3) + loc (3) rows of all items, i.e. the vertex pairs
+    me = vectors_get(props.id_data).data
+    me.vertices.foreach_set("co", np.ascontiguousarray(vec).ravel())
+    me.update()
+
+
+# ------------------------------------------------------------------------------
+#
+# ---------------------------- DISPLAY SWITCH ----------------------------------
+
+# Two objects per item cost two transform writes per item and frame: above
+# SHARED_DISPLAY_MIN items a frame cannot be drawn in time. With 'display_auto'
+# on, the add operators then switch to the shared display (points: INSTANCES,
+# vectors: MESH), which is one mesh write each. Nothing switches back when
+# items are removed; turn 'display_auto' off to keep the objects.
+
+
+def display_auto(props, count=0):
+    # call from: 'OT_sub_add', 'subs_add'
+
+    # switch to the shared display if the items ('count' more to come) are
+    # above the limit
+    if not props.display_auto or len(props.subs) + count <= SHARED_DISPLAY_MIN:
+        return
+    # each switch replaces the objects and updates the scene (see the 'update'
+    # callbacks), so only the ones not set yet
+    if props.pnt_display != "INSTANCES":
+        props.pnt_display = "INSTANCES"
+    if props.vec_display != "MESH":
+        props.vec_display = "MESH"
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------ BATCH EDITS -----------------------------------
+
+# Python API for large edits. Each call changes any number of items with one
+# cache reset, one 'subs_idx' update (parent list) and one evaluation:
+#
+#   ids = subs_add(scene, 1000)                 # 1000 root items
+#   kids = subs_add(scene, 10, parent=ids[0])   # 10 children of the first
+#   subs_parent(scene, ids[1:500], ids[0])
+#   subs_remove(scene, ids[500:])
+#
+# Indices are those of 'props.subs' at the time of the call (a removal moves
+# the items after it). The 'ptdobrels.subs_*' operators apply these to the
+# selected items, as one undo step each.
+
+
+def selected_ids(props):
+    # indices of the items with 'select' on
+    return np.flatnonzero(subs_get(props.subs, "select", 1, bool)).tolist()
+
+
+def subs_add(scene, count, parent=-1):
+    # call from: 'OT_subs_add'
+
+    # add 'count' items as children of item 'parent' (-1: root items)
+    # returns the indices of the new items
+    props = scene.ptdobrels_props
+    subs = props.subs
+    count = min(count, props.subs_max - len(subs))
+    if count < 1:
+        return []
+    pid = subs[parent].uid if parent > -1 else 0
+    display_auto(props, count)
+    ids = list(range(len(subs), len(subs) + count))
+    for i in ids:
+        item = subs.add()
+        item.uid = uid_new(props)
+        item.pid = pid
+        name = "obj"
+        if props.pnt_display == "OBJECTS":
+            name = pnt_ob_new(scene, item).name
+        if props.vec_display == "OBJECTS":
+            vec_ob_new(scene, item, name)
+    props.cache_reset()
+    props.subs_idx = ids[-1]
+    # new leaves: the other items keep their evaluated values
+    update_subs(props, ids)
+    return ids
+
+
+def subs_parent(scene, ids, parent=-1):
+    # call from: 'OT_subs_parent'
+
+    # make item 'parent' (-1: none) the parent of the items 'ids'
+    props = scene.ptdobrels_props
+    subs = props.subs
+    ids = sorted(set(ids))
+    nodes = cache_get(props).nodes
+    if parent > -1:
+        moved = set()
+        for i in ids:
+            moved.update(nodes.subtree(i))
+        if parent in moved:
+            raise ValueError("cannot parent to a selected item or its descendant")
+    pid = subs[parent].uid if parent > -1 else 0
+    for i in ids:
+        subs[i].pid = pid
+    props.cache_reset()
+    # the moved subtrees are now disjoint (siblings): evaluate them only
+    nodes = cache_get(props).nodes
+    order = [j for i in ids for j in nodes.subtree(i)]
+    update_subs(props, order)
+
+
+def subs_remove(scene, ids):
+    # call from: 'OT_sub_remove', 'OT_subs_remove'
+
+    # remove the items 'ids'; their children move up to the nearest
+    # ancestor that is kept
+    props = scene.ptdobrels_props
+    subs = props.subs
+    ids = sorted(set(ids))
+    cache = cache_get(props)
+    parents = cache.parents
+    gone = [False] * len(subs)
+    for i in ids:
+        gone[i] = True
+    # one pass, parents first: heir[i] is 'i' if kept, else its new stand-in
+    heir = [-1] * len(subs)
+    for i in cache.order:
+        p = parents[i]
+        up = heir[p] if p > -1 else -1
+        if gone[i]:
+            heir[i] = up
             continue
-        update_sub(props, item)
+        heir[i] = i
+        if up != p:
+            subs[i].pid = subs[up].uid if up > -1 else 0
+    temps_remove([subs[i] for i in ids], shared=len(ids) == len(subs))
+    idx = props.subs_idx
+    shift = sum(1 for i in ids if i < idx)
+    for i in sorted(ids, reverse=True):
+        subs.remove(i)
+    props.cache_reset()
+    if idx > -1 and gone[idx]:
+        # the active item was removed: select the one before it
+        shift += 1
+    props.subs_idx = min(max(0, idx - shift), len(subs) - 1)
+    if props.subs_idx < 0:
+        props.p_idx = -1
+        return
+    scene_update(scene)
+
+
+# ------------------------------------------------------------------------------
+#
+# --------------------------------- BAKE ---------------------------------------
+
+# A bake holds the animation as played from 'bake_start' to 'bake_end', one
+# row per frame: the FRAME_FIELDS arrays of all items, each field stored as a
+# contiguous block so that it can be passed from the memory map to
+# foreach_set without a copy. The file is a plain .npy next to the .blend.
+
+_bakes = {}
+
+
+def bake_path(scene):
+    name = bpy.path.display_name_from_filepath(bpy.data.filepath)
+    return bpy.path.abspath(f"//{name}_{bpy.path.clean_name(scene.name)}_rels.npy")
+
+
+def bake_key(props, cache):
+    # digest of the topology and item parameters the bake was made with
+    if cache.bake_key is None:
+        subs = props.subs
+        iloc = subs_get(subs, "iloc", 3)
+        arrs = [
+            cache.parents_np,
+            iloc,
+            pivot_flags(props, cache),
+            subs_get(subs, "rotinf", 1, bool),
+        ]
+        # the angles the animation does not set are carried into every frame,
+        # unless the bake starts on the frame that resets them (value 0)
+        if frame_value(props.bake_start):
+            arrs.append(held_rotang(subs_get(subs, "rotang", 3), iloc[:, 2] != 0))
+        digest = hashlib.sha1(str(len(subs)).encode())
+        for arr in arrs:
+            digest.update(np.ascontiguousarray(arr).tobytes())
+        cache.bake_key = digest.hexdigest()
+    return cache.bake_key
+
+
+def bake_frames(props, start, end, path):
+    # call from: 'OT_bake'
+
+    subs = props.subs
+    cache = cache_get(props)
+    n = len(subs)
+    width = sum(size for attr, size in FRAME_FIELDS) * n
+    bake = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float32, shape=(end - start + 1, width)
+    )
+    nodes = nodes_pull(props, cache)
+    for k in range(end - start + 1):
+        nodes.animate(frame_value(start + k))
+        nodes.evaluate()
+        res = (nodes.rotang, nodes.loc, nodes.rot, nodes.ploc, nodes.prot)
+        bake[k] = np.concatenate([a.ravel() for a in res])
+    # 'rotang' of the nodes holds the last baked frame
+    cache.params = None
+    bake.flush()
+    del bake
+
+
+def bake_get(path):
+    # memory map of the bake file, opened once
+    bake = _bakes.get(path)
+    if bake is None and os.path.isfile(path):
+        bake = _bakes[path] = np.load(path, mmap_mode="r")
+    return bake
+
+
+def bake_valid(props, path):
+    bake = bake_get(path)
+    if bake is None or not props.bake_key:
+        return False
+    width = sum(size for attr, size in FRAME_FIELDS) * len(props.subs)
+    if bake.shape != (props.bake_end - props.bake_start + 1, width):
+        return False
+    return bake_key(props, cache_get(props)) == props.bake_key
+
+
+def bake_update(scene):
+    # call from: 'fcpre'
+
+    # play the current frame from the bake; False if it must be evaluated
+    props = scene.ptdobrels_props
+    frame = scene.frame_current
+    if not (props.bake_start <= frame <= props.bake_end) or not props.subs:
+        return False
+    path = bake_path(scene)
+    if not bake_valid(props, path):
+        return False
+    row = bake_get(path)[frame - props.bake_start]
+    n = len(props.subs)
+    arrs = []
+    ofs = 0
+    for attr, size in FRAME_FIELDS:
+        arrs.append(row[ofs : ofs + size * n])
+        ofs += size * n
+    frame_apply(props, arrs)
+    return True
 
 
 # ------------------------------------------------------------------------------
@@ -273,40 +1410,31 @@ class PTDOBRELS_OT_sub_add(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         props = context.scene.ptdobrels_props
-        return len(props.subs) < 20
+        return len(props.subs) < props.subs_max
 
     def execute(self, context):
         scene = context.scene
         props = scene.ptdobrels_props
         try:
+            # before the new item: all items have their objects while it runs
+            display_auto(props, 1)
             item = props.subs.add()
-            item.uid = self.sub_uid_get()
+            item.uid = uid_new(props)
+            props.cache_reset()
             props.subs_idx = len(props.subs) - 1
-            coll = scene.collection.children["base_objects"]
-            item.pnt_ob = coll.objects["pob"].copy()
-            item.pnt_ob.name = "obj"
-            item.pnt_ob.location = (0, 0, 0)
-            item.pnt_ob.hide_viewport = False
-            scene.collection.objects.link(item.pnt_ob)
-            item.vec_ob = coll.objects["vob"].copy()
-            item.vec_ob.name = f"{item.pnt_ob.name}_vec"
-            item.vec_ob.scale[1] = 0.01
-            item.vec_ob.hide_viewport = False
-            scene.collection.objects.link(item.vec_ob)
+            name = "obj"
+            if props.pnt_display == "OBJECTS":
+                name = pnt_ob_new(scene, item).name
+            if props.vec_display == "OBJECTS":
+                vec_ob_new(scene, item, name)
+            if props.pnt_display == "INSTANCES" or props.vec_display == "MESH":
+                # the shared display objects need a new point/edge
+                scene_update(scene, props.subs_idx)
         except Exception as my_err:
             print(f"sub_add: {my_err.args}")
             return {"CANCELLED"}
         return {"FINISHED"}
 
-    def sub_uid_get(self):
-        # make a UUID based on the host ID and current time
-        # uuid.uuid1()
-        # make a random UUID
-        # uuid.uuid4()
-
-        x = uuid.uuid4()
-        return str(x)
-
 
 class PTDOBRELS_OT_sub_remove(bpy.types.Operator):
     bl_label = "Remove"
@@ -315,6 +1443,7 @@ class PTDOBRELS_OT_sub_remove(bpy.types.Operator):
     bl_options = {"REGISTER", "INTERNAL", "UNDO"}
 
     doall: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
+    subtree: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
 
     @classmethod
     def poll(cls, context):
@@ -326,40 +1455,23 @@ class PTDOBRELS_OT_sub_remove(bpy.types.Operator):
         props = scene.ptdobrels_props
         try:
             if self.doall:
-                for item in props.subs:
-                    self.remove_temps(scene, item)
+                # all objects (and meshes) in one batch
+                temps_remove(props.subs, shared=True)
                 props.subs.clear()
+                props.cache_reset()
                 props.subs_idx = -1
                 props.p_idx = -1
                 return {"FINISHED"}
             idx = props.subs_idx
-            item = props.subs[idx]
-            self.remove_temps(scene, item)
-            for b in props.subs:
-                if b.pid == item.uid:
-                    b.pid = item.pid
-            props.subs.remove(idx)
-            props.subs_idx = min(max(0, idx - 1), len(props.subs) - 1)
-            if props.subs_idx < 0:
-                props.p_idx = -1
-                return {"FINISHED"}
-            # scene updates
-            scene_update(scene)
+            # the item and its branch, or the item alone (children move up)
+            ids = props.subtree(idx) if self.subtree else (idx,)
+            # one pass and one scene update
+            subs_remove(scene, ids)
         except Exception as my_err:
             print(f"sub_remove: {my_err.args}")
             return {"CANCELLED"}
         return {"FINISHED"}
 
-    def remove_temps(self, scene, item):
-        # remove linked copies
-
-        ob = item.pnt_ob
-        if ob:
-            bpy.data.objects.remove(ob)
-        ob = item.vec_ob
-        if ob:
-            bpy.data.objects.remove(ob)
-
 
 class PTDOBRELS_OT_sub_parent(bpy.types.Operator):
     bl_label = "Set Parent"
@@ -375,12 +1487,13 @@ class PTDOBRELS_OT_sub_parent(bpy.types.Operator):
         try:
             item = props.subs[props.subs_idx]
             if not self.val:
-                item.pid = ""
+                item.pid = 0
             else:
                 p = props.subs[int(props.parent_enum)]
                 item.pid = p.uid
+            props.cache_reset()
             # scene updates
-            scene_update(scene)
+            scene_update(scene, props.subs_idx)
         except Exception as my_err:
             print(f"sub_parent: {my_err.args}")
             return {"CANCELLED"}
@@ -393,7 +1506,7 @@ class PTDOBRELS_OT_sub(bpy.types.Operator):
     bl_description = "edit sub system"
     bl_options = {"REGISTER", "INTERNAL", "UNDO"}
 
-    pid: bpy.props.StringProperty(default="")
+    pid: bpy.props.IntProperty(default=0)
     iloc: bpy.props.FloatVectorProperty(
         size=3, default=[0, 0, 0], subtype="TRANSLATION"
     )
@@ -428,8 +1541,9 @@ class PTDOBRELS_OT_sub(bpy.types.Operator):
         pd = self.as_keywords(ignore=("pid",))
         for key in pd.keys():
             setattr(item, key, getattr(self, key))
+        props.params_reset()
         try:
-            scene_update(scene)
+            scene_update(scene, props.subs_idx)
         except Exception as my_err:
             print(f"sub_edit: {my_err.args}")
             return {"CANCELLED"}
@@ -457,6 +1571,210 @@ class PTDOBRELS_OT_sub(bpy.types.Operator):
         row.prop(self, "rotinf", text="Inherit Parent Rotation", toggle=True)
 
 
+class PTDOBRELS_OT_subs_add(bpy.types.Operator):
+    bl_label = "Add Many"
+    bl_idname = "ptdobrels.subs_add"
+    bl_description = "add sub systems, as root items or children of the active one"
+    bl_options = {"REGISTER", "INTERNAL", "UNDO"}
+
+    count: bpy.props.IntProperty(default=10, min=1, options={"HIDDEN"})
+    # add under the active item
+    child: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
+
+    @classmethod
+    def poll(cls, context):
+        props = context.scene.ptdobrels_props
+        return len(props.subs) < props.subs_max
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ptdobrels_props
+        try:
+            parent = props.subs_idx if self.child else -1
+            subs_add(scene, self.count, parent)
+        except Exception as my_err:
+            print(f"subs_add: {my_err.args}")
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+
+class PTDOBRELS_OT_subs_select(bpy.types.Operator):
+    bl_label = "Select"
+    bl_idname = "ptdobrels.subs_select"
+    bl_description = "select sub systems for the batch edits"
+    bl_options = {"REGISTER", "INTERNAL", "UNDO"}
+
+    action: bpy.props.EnumProperty(
+        items=(
+            ("ALL", "All", "select all"),
+            ("NONE", "None", "deselect all"),
+            ("INVERT", "Invert", "invert the selection"),
+            ("SUBTREE", "Subtree", "select the active item and its descendants"),
+        ),
+        options={"HIDDEN"},
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return bool(context.scene.ptdobrels_props.subs)
+
+    def execute(self, context):
+        props = context.scene.ptdobrels_props
+        subs = props.subs
+        try:
+            if self.action == "SUBTREE":
+                sel = subs_get(subs, "select", 1, bool)
+                sel[props.subtree(props.subs_idx)] = True
+            elif self.action == "INVERT":
+                sel = ~subs_get(subs, "select", 1, bool)
+            else:
+                sel = np.full(len(subs), self.action == "ALL")
+            subs_set(subs, "select", sel, bool)
+        except Exception as my_err:
+            print(f"subs_select: {my_err.args}")
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+
+class PTDOBRELS_OT_subs_parent(bpy.types.Operator):
+    bl_label = "Parent Selected"
+    bl_idname = "ptdobrels.subs_parent"
+    bl_description = "set (or free) the parent of the selected sub systems"
+    bl_options = {"REGISTER", "INTERNAL", "UNDO"}
+
+    # parent flag: True=the 'parent_enum' item, False=none
+    val: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
+
+    @classmethod
+    def poll(cls, context):
+        props = context.scene.ptdobrels_props
+        return bool(props.subs) and bool(selected_ids(props))
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ptdobrels_props
+        try:
+            parent = int(props.parent_enum) if self.val and props.p_idx > -1 else -1
+            subs_parent(scene, selected_ids(props), parent)
+        except ValueError as my_err:
+            self.report({"WARNING"}, str(my_err))
+            return {"CANCELLED"}
+        except Exception as my_err:
+            print(f"subs_parent: {my_err.args}")
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+
+class PTDOBRELS_OT_subs_remove(bpy.types.Operator):
+    bl_label = "Remove Selected"
+    bl_idname = "ptdobrels.subs_remove"
+    bl_description = "remove the selected sub systems"
+    bl_options = {"REGISTER", "INTERNAL", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        props = context.scene.ptdobrels_props
+        return bool(props.subs) and bool(selected_ids(props))
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ptdobrels_props
+        try:
+            subs_remove(scene, selected_ids(props))
+        except Exception as my_err:
+            print(f"subs_remove: {my_err.args}")
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+
+class PTDOBRELS_OT_bake(bpy.types.Operator):
+    bl_label = "Bake"
+    bl_idname = "ptdobrels.bake"
+    bl_description = "bake the animation of the scene frame range to a file"
+    bl_options = {"REGISTER", "INTERNAL"}
+
+    # delete the bake file instead
+    free: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
+
+    @classmethod
+    def poll(cls, context):
+        props = context.scene.ptdobrels_props
+        return bool(bpy.data.filepath) and bool(props.subs)
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ptdobrels_props
+        path = bake_path(scene)
+        # release the memory map before the file is replaced
+        _bakes.pop(path, None)
+        try:
+            if self.free:
+                if os.path.isfile(path):
+                    os.remove(path)
+                props.bake_key = ""
+                return {"FINISHED"}
+            start, end = scene.frame_start, scene.frame_end
+            bake_frames(props, start, end, path)
+            props.bake_start = start
+            props.bake_end = end
+            # the key depends on the start frame (see 'bake_key')
+            cache = cache_get(props)
+            cache.bake_key = None
+            props.bake_key = bake_key(props, cache)
+        except Exception as my_err:
+            print(f"bake: {my_err.args}")
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+
+class PTDOBRELS_OT_profile(bpy.types.Operator):
+    bl_label = "Profile"
+    bl_idname = "ptdobrels.profile"
+    bl_description = "start/stop timing the hot paths"
+    bl_options = {"REGISTER", "INTERNAL"}
+
+    # clear the records instead
+    reset: bpy.props.BoolProperty(default=False, options={"HIDDEN"})
+
+    def execute(self, context):
+        if self.reset:
+            _profile.reset()
+        else:
+            _profile.on = not _profile.on
+        return {"FINISHED"}
+
+
+class PTDOBRELS_OT_profile_dump(bpy.types.Operator):
+    bl_label = "Save CSV"
+    bl_idname = "ptdobrels.profile_dump"
+    bl_description = "save the profiling records to a CSV file"
+    bl_options = {"REGISTER", "INTERNAL"}
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.csv", options={"HIDDEN"})
+
+    @classmethod
+    def poll(cls, context):
+        return any(_profile.records.values())
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            name = bpy.path.display_name_from_filepath(bpy.data.filepath)
+            self.filepath = f"{name or 'untitled'}_rels_profile.csv"
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        try:
+            path = bpy.path.abspath(self.filepath)
+            n = _profile.csv_write(path)
+            self.report({"INFO"}, f"{n} records saved to {path}")
+        except Exception as my_err:
+            print(f"profile_dump: {my_err.args}")
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+
 class PTDOBRELS_OT_obnames(bpy.types.Operator):
     bl_label = "Show Names"
     bl_idname = "ptdobrels.obnames"
@@ -492,12 +1810,12 @@ class PTDOBRELS_UL_subs(bpy.types.UIList):
         self.use_filter_show = False
         p_name = ""
         if item.pid:
-            for i in data.subs:
-                if i.uid == item.pid:
-                    p_name = i.name
-                    break
-        col = layout.column()
-        col.prop(item, "name", text="", emboss=False, icon="RADIOBUT_ON")
+            i = data.uid_index(item.pid)
+            if i > -1:
+                p_name = data.subs[i].name
+        row = layout.row(align=True)
+        row.prop(item, "select", text="")
+        row.prop(item, "name", text="", emboss=False, icon="RADIOBUT_ON")
         col = layout.column()
         col.label(text=f"p: {p_name}")
 
@@ -516,6 +1834,7 @@ class PTDOBRELS_PT_ui(bpy.types.Panel):
     def poll(cls, context):
         return req_check(context.scene)
 
+    @profiled("draw", callback=True)
     def draw(self, context):
         scene = context.scene
         props = scene.ptdobrels_props
@@ -526,7 +1845,13 @@ class PTDOBRELS_PT_ui(bpy.types.Panel):
         c = layout.column(align=True)
         row = c.row(align=True)
         row.operator("ptdobrels.sub_add")
-        row.operator("ptdobrels.sub_remove").doall = False
+        # the buttons set both flags: unset ones keep their last used value
+        op = row.operator("ptdobrels.sub_remove")
+        op.doall = False
+        op.subtree = False
+        op = row.operator("ptdobrels.sub_remove", text="Branch")
+        op.doall = False
+        op.subtree = True
         row.operator("ptdobrels.sub_remove", text="Clear").doall = True
         row = c.row(align=True)
 
@@ -565,6 +1890,127 @@ class PTDOBRELS_PT_ui(bpy.types.Panel):
             row.label(text="no subs")
 
 
+class PTDOBRELS_PT_settings(bpy.types.Panel):
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_context = "objectmode"
+    bl_category = "RELS"
+    bl_label = "Settings"
+    bl_parent_id = "PTDOBRELS_PT_ui"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        scene = context.scene
+        props = scene.ptdobrels_props
+        layout = self.layout
+        layout.enabled = not context.screen.is_animation_playing
+
+        row = layout.row(align=True)
+        row.label(text="Engine")
+        row.prop(props, "engine", expand=True)
+        row = layout.row(align=True)
+        row.label(text="Points")
+        row.prop(props, "pnt_display", expand=True)
+        row = layout.row(align=True)
+        row.label(text="Vectors")
+        row.prop(props, "vec_display", expand=True)
+        row = layout.row(align=True)
+        text = f"Shared Display Above {SHARED_DISPLAY_MIN}"
+        row.prop(props, "display_auto", text=text)
+        col = layout.column(align=True)
+        col.prop(props, "subs_max")
+        col.prop(props, "frame_cache_mb")
+        cache = _caches.get(props.as_pointer())
+        if cache and cache.frames:
+            mb = cache.frames_size / 2**20
+            col.label(text=f"cached: {len(cache.frames)} frames, {mb:.1f} MB")
+        info = PTDOBRELS_props.parent_enum_items.cache_info()
+        col.label(text=f"parent list: {info['hits']} hits, {info['misses']} misses")
+        # bake
+        box = layout.box()
+        row = box.row(align=True)
+        row.operator("ptdobrels.bake").free = False
+        row.operator("ptdobrels.bake", text="Free Bake").free = True
+        row = box.row(align=True)
+        row.enabled = bool(props.bake_key)
+        row.prop(props, "use_bake", toggle=True)
+        if props.bake_key:
+            valid = bool(props.subs) and bake_valid(props, bake_path(scene))
+            state = "" if valid else " (stale)"
+            box.label(text=f"frames {props.bake_start}-{props.bake_end}{state}")
+
+
+class PTDOBRELS_PT_batch(bpy.types.Panel):
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_context = "objectmode"
+    bl_category = "RELS"
+    bl_label = "Batch Edit"
+    bl_parent_id = "PTDOBRELS_PT_ui"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        scene = context.scene
+        props = scene.ptdobrels_props
+        layout = self.layout
+        layout.enabled = not context.screen.is_animation_playing
+
+        col = layout.column(align=True)
+        col.prop(props, "batch_count")
+        row = col.row(align=True)
+        op = row.operator("ptdobrels.subs_add", text="Add Roots")
+        op.count, op.child = props.batch_count, False
+        sub = row.row(align=True)
+        sub.enabled = bool(props.subs)
+        op = sub.operator("ptdobrels.subs_add", text="Add Children")
+        op.count, op.child = props.batch_count, True
+        if not props.subs:
+            return
+        col = layout.column(align=True)
+        row = col.row(align=True)
+        for action in ("ALL", "NONE", "INVERT", "SUBTREE"):
+            row.operator("ptdobrels.subs_select", text=action.title()).action = action
+        col.label(text=f"{len(selected_ids(props))} selected")
+        row = col.row(align=True)
+        row.operator("ptdobrels.subs_parent", text="Parent").val = True
+        row.operator("ptdobrels.subs_parent", text="Free").val = False
+        row.operator("ptdobrels.subs_remove", text="Remove")
+
+
+class PTDOBRELS_PT_stats(bpy.types.Panel):
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_context = "objectmode"
+    bl_category = "RELS"
+    bl_label = "Profile"
+    bl_parent_id = "PTDOBRELS_PT_ui"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+
+        row = layout.row(align=True)
+        cap = "Stop" if _profile.on else "Start"
+        row.operator("ptdobrels.profile", text=cap, depress=_profile.on).reset = False
+        row.operator("ptdobrels.profile", text="Reset").reset = True
+        row.operator("ptdobrels.profile_dump", text="CSV")
+        stats = _profile.stats()
+        if not stats:
+            layout.label(text="no records")
+            return
+        # one row per stage: number of calls, then last/avg/p95 times
+        rows = [("stage", "calls", "last ms", "avg", "p95")]
+        for stage, (calls, *times) in stats.items():
+            rows.append((stage, str(calls), *(f"{ms:.3f}" for ms in times)))
+        col = layout.column(align=True)
+        for texts in rows:
+            split = col.row(align=True).split(factor=0.4, align=True)
+            split.label(text=texts[0])
+            row = split.row(align=True)
+            for text in texts[1:]:
+                row.label(text=text)
+
+
 # ------------------------------------------------------------------------------
 #
 # ---------------------------- REGISTER OBJECTS --------------------------------
@@ -576,14 +2022,28 @@ classes = (
     PTDOBRELS_OT_sub_remove,
     PTDOBRELS_OT_sub_parent,
     PTDOBRELS_OT_sub,
+    PTDOBRELS_OT_subs_add,
+    PTDOBRELS_OT_subs_select,
+    PTDOBRELS_OT_subs_parent,
+    PTDOBRELS_OT_subs_remove,
+    PTDOBRELS_OT_bake,
+    PTDOBRELS_OT_profile,
+    PTDOBRELS_OT_profile_dump,
     PTDOBRELS_OT_obnames,
     PTDOBRELS_UL_subs,
     PTDOBRELS_PT_ui,
+    PTDOBRELS_PT_settings,
+    PTDOBRELS_PT_batch,
+    PTDOBRELS_PT_stats,
 )
 
 
-def fcpre(scene):
-    val = radians((scene.frame_current - 1) * 3)
+@profiled("fcpre")
+def fcpre(scene, depsgraph=None):
+    # Blender passes the depsgraph too: the profiling wrapper takes any arguments
+    if scene.ptdobrels_props.use_bake and bake_update(scene):
+        return
+    val = frame_value(scene.frame_current)
     scene_update_frames(scene, val)
 
 
@@ -595,8 +2055,41 @@ def remove_fcpre_handlers():
         bpy.app.handlers.frame_change_pre.remove(h)
 
 
+cache_handlers = (
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post,
+)
+
+
+def remove_cache_handlers():
+    for handlers in cache_handlers:
+        for h in [h for h in handlers if h.__name__ == "ptdobrels_cache_clear"]:
+            handlers.remove(h)
+
+
+@persistent
+def ptdobrels_uids_migrate(*args):
+    # call from: 'register', load_post handler
+
+    # files saved with UUID string ids get integer ones (see 'uids_migrate')
+    for scene in getattr(bpy.data, "scenes", ()):
+        n = uids_migrate(scene.ptdobrels_props)
+        if n:
+            print(f"{scene.name}: {n} sub systems converted to integer ids")
+            cache_reset(scene.ptdobrels_props)
+
+
+def remove_migrate_handlers():
+    handlers = bpy.app.handlers.load_post
+    for h in [h for h in handlers if h.__name__ == "ptdobrels_uids_migrate"]:
+        handlers.remove(h)
+
+
 def register():
     remove_fcpre_handlers()
+    remove_cache_handlers()
+    remove_migrate_handlers()
 
     from bpy.utils import register_class
 
@@ -605,10 +2098,20 @@ def register():
     bpy.types.Scene.ptdobrels_props = bpy.props.PointerProperty(type=PTDOBRELS_props)
 
     bpy.app.handlers.frame_change_pre.append(fcpre)
+    for handlers in cache_handlers:
+        handlers.append(ptdobrels_cache_clear)
+    bpy.app.handlers.load_post.append(ptdobrels_uids_migrate)
+    # the open file (not available while add-ons load at startup)
+    ptdobrels_uids_migrate()
 
 
 def unregister():
     remove_fcpre_handlers()
+    remove_cache_handlers()
+    remove_migrate_handlers()
+    ptdobrels_cache_clear()
+    _profile.on = False
+    _profile.reset()
 
     from bpy.utils import unregister_class
 
@@ -0,0 +1,260 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+import bpy
+import os
+import sys
+import json
+import random
+import platform
+import statistics
+import numpy as np
+
+from time import perf_counter, strftime
+from types import SimpleNamespace
+
+# the demo module lives next to this file
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import enum_ex3b as ex3b  # noqa: E402
+
+
+# SCALING BENCHMARK FOR THE "enum_ex3b" DEMO. RUN FROM THE COMMAND LINE:
+#
+#   blender -b --factory-startup --python enum_ex3b_bench.py -- 1000 10000
+#
+# (the numbers are the tree sizes to test, default: 1000 10000; tree shape
+# names limit the shapes, default: all of SHAPES; '--out results.json' also
+# writes all results, with the Blender version, to a file)
+#
+#   random: every item has an earlier one as parent (90%), a shallow tree
+#   chain : every item is the child of the one before, depth n
+#   comb  : a chain of n/2 items, each with one leaf, depth n/2
+#
+# Every interactive action is checked against BUDGET_MS, for each shape:
+#   add, remove, reparent, edit  : one operator call on a tree of size n
+#   select                       : select an item (rebuilds the parent list)
+#   redraw                       : the Python side of a redraw of the panels
+#                                  (main, Settings, Batch Edit) and the list
+#                                  rows, on a layout that records nothing
+#   frame                        : one animated frame as played: evaluation,
+#                                  bulk I/O and the display writes
+#
+# The items are added as "Add Many" does, so the display is the one the demo
+# picks: objects up to SHARED_DISPLAY_MIN items, the shared display above it
+# (see 'display_auto'). 'clear' (the Clear button) is reported for reference.
+#
+# The summary lists every size and shape where an action goes over the
+# budget. In a Blender 4.2 run ('bench/ex3b_blender_4.2.json') all actions but
+# 'remove' stay within it at 1k items. At 10k only 'select' and 'redraw' do: a
+# frame takes 30-45 ms (bulk property I/O, tree math, Blender's update of the
+# shared meshes) and the operators 70-190 ms.
+
+BUDGET_MS = 16.0
+REPEAT = 9
+SHAPES = ("random", "chain", "comb")
+
+
+def timed(func, repeat=REPEAT, setup=None):
+    # median time in ms
+
+    res = []
+    for k in range(repeat):
+        if setup:
+            setup(k)
+        t = perf_counter()
+        func()
+        res.append((perf_counter() - t) * 1000)
+    return statistics.median(res)
+
+
+def tree_parent(shape, i, rnd):
+    # call from: 'build'
+
+    # parent index of item i > 0 (always an earlier item: no loops), -1: root
+    if shape == "chain":
+        return i - 1
+    if shape == "comb":
+        # even items form the spine, odd items are its leaves
+        return i - 2 if i % 2 == 0 else i - 1
+    return rnd.randrange(i) if rnd.random() < 0.9 else -1
+
+
+def build(scene, shape, n, rnd):
+    # call from: 'bench'
+
+    props = scene.ptdobrels_props
+    if props.subs:
+        bpy.ops.ptdobrels.sub_remove(doall=True)
+    # room for the items 'add' adds on top of n
+    props.subs_max = max(props.subs_max, n + REPEAT)
+    t = perf_counter()
+    # as "Add Many": the display is picked once for all n items
+    bpy.ops.ptdobrels.subs_add(count=n, child=False)
+    subs = props.subs
+    for i in range(1, n):
+        p = tree_parent(shape, i, rnd)
+        if p > -1:
+            subs[i].pid = subs[p].uid
+    props.cache_reset()
+    vals = [rnd.uniform(-1, 1) for i in range(n * 3)]
+    subs.foreach_set("iloc", vals)
+    subs.foreach_set("rotinf", [rnd.random() < 0.7 for i in range(n)])
+    ex3b.scene_update(scene)
+    return perf_counter() - t
+
+
+class Layout:
+    # stands in for the UILayout of a redraw (background mode has none): any
+    # call returns a new layout, attributes can be set. The list draws its
+    # visible rows, and 'prop' reads the value, as Blender does to draw it
+
+    def __getattr__(self, name):
+        return self.sub
+
+    def sub(self, *args, **kwargs):
+        return Layout()
+
+    def prop(self, data, attr, **kwargs):
+        getattr(data, attr)
+        return Layout()
+
+    def template_list(self, listtype, list_id, data, attr, active, active_attr, **kw):
+        items = getattr(data, attr)
+        rows = kw.get("maxrows", 5)
+        start = max(0, min(getattr(active, active_attr), len(items) - rows))
+        draw_item = getattr(ex3b, listtype).draw_item
+        for i in range(start, min(len(items), start + rows)):
+            ui_list = SimpleNamespace(use_filter_show=True)
+            draw_item(ui_list, CONTEXT, Layout(), data, items[i], 0, active, attr, i)
+
+
+CONTEXT = SimpleNamespace(screen=SimpleNamespace(is_animation_playing=False))
+PANELS = ("PTDOBRELS_PT_ui", "PTDOBRELS_PT_settings", "PTDOBRELS_PT_batch")
+
+
+def redraw(scene):
+    # call from: 'bench'
+
+    CONTEXT.scene = scene
+    for name in PANELS:
+        cls = getattr(ex3b, name)
+        if not hasattr(cls, "poll") or cls.poll(CONTEXT):
+            cls.draw(SimpleNamespace(layout=Layout()), CONTEXT)
+
+
+def bench(scene, shape, n, seed=1):
+    # call from: 'main'
+
+    rnd = random.Random(seed)
+    props = scene.ptdobrels_props
+    res = {"shape": shape, "n": n, "build_s": round(build(scene, shape, n, rnd), 3)}
+    ms = res["ms"] = {}
+    cache = ex3b.cache_get(props)
+    leaves = [i for i in range(n) if i not in cache.children]
+
+    # add the last item, then remove it
+    def last(k):
+        props.subs_idx = len(props.subs) - 1
+
+    ms["add"] = timed(bpy.ops.ptdobrels.sub_add)
+    ms["remove"] = timed(bpy.ops.ptdobrels.sub_remove, setup=last)
+
+    # reparent leaves (a leaf cannot be an ancestor of its new parent)
+    def pick_parent(k):
+        props.subs_idx = rnd.choice(leaves)
+        props.parent_enum = str(rnd.randrange(props.subs_idx))
+
+    ms["reparent"] = timed(
+        lambda: bpy.ops.ptdobrels.sub_parent(val=True), setup=pick_parent
+    )
+
+    # edit a random item: updates its subtree
+    def pick(k):
+        props.subs_idx = rnd.randrange(n)
+
+    def edit():
+        item = props.subs[props.subs_idx]
+        bpy.ops.ptdobrels.sub(
+            iloc=item.iloc,
+            rotang=(rnd.random(), 0, 0),
+            rotpiv=item.rotpiv,
+            rotinf=item.rotinf,
+        )
+
+    ms["edit"] = timed(edit, setup=pick)
+
+    def select():
+        props.subs_idx = rnd.randrange(n)
+
+    ms["select"] = timed(select)
+    ms["redraw"] = timed(lambda: redraw(scene))
+
+    # animation: no frame cache, a new frame every time
+    props.frame_cache_mb = 0
+    frames = iter(range(2, 2 + 8 * REPEAT))
+    res["display"] = [props.pnt_display, props.vec_display]
+    ms["frame"] = timed(lambda: scene.frame_set(next(frames)))
+    props.frame_cache_mb = 64
+    ms["clear"] = timed(lambda: bpy.ops.ptdobrels.sub_remove(doall=True), repeat=1)
+
+    budget = ("add", "remove", "reparent", "edit", "select", "redraw", "frame")
+    res["over_budget"] = [key for key in budget if ms[key] > BUDGET_MS]
+    for key, val in ms.items():
+        ms[key] = round(val, 3)
+    return res
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    sizes = [int(a) for a in argv if a.isdigit()] or [1000, 10000]
+    shapes = [a for a in argv if a in SHAPES] or SHAPES
+    out_path = argv[argv.index("--out") + 1] if "--out" in argv else None
+    scene = bpy.context.scene
+    if "base_objects" not in scene.collection.children:
+        import enum_ex3b_setup  # noqa: F401
+    ex3b.register()
+    props = scene.ptdobrels_props
+    props.engine = "NUMPY"
+    out = []
+    for shape in shapes:
+        for n in sizes:
+            res = bench(scene, shape, n)
+            print(json.dumps(res))
+            out.append(res)
+    ex3b.unregister()
+    over = [(r["shape"], r["n"], r["over_budget"]) for r in out if r["over_budget"]]
+    print(f"budget {BUDGET_MS} ms: {'FAIL ' + str(over) if over else 'OK'}")
+    if out_path:
+        meta = {
+            "blender": bpy.app.version_string,
+            "date": strftime("%Y-%m-%d"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "budget_ms": BUDGET_MS,
+            "repeat": REPEAT,
+        }
+        with open(out_path, "w") as f:
+            json.dump({"meta": meta, "results": out}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
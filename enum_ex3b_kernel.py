@@ -0,0 +1,370 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+# Relations kernel for "enum_ex3b": the hierarchy math on plain arrays. It
+# does not import bpy, so it can run in a worker process or outside Blender;
+# "enum_ex3b" keeps a 'Nodes' object per item list and syncs it with the
+# 'PTDOBRELS_props' collection at the boundaries (see its KERNEL ADAPTER).
+# Keep this file next to "enum_ex3b": the demo adds its folder to 'sys.path'.
+
+
+import numpy as np
+
+from functools import cached_property
+from math import radians
+
+
+# ------------------------------------------------------------------------------
+#
+# -------------------------------- NODES ---------------------------------------
+
+# One row per node (item), indexed like the 'subs' collection:
+#
+#   parents : parent index (-1 for roots), also as 'parents_np'
+#   iloc    : (n, 3) local offset from the parent
+#   rotang  : (n, 3) XYZ euler angles
+#   pivot   : (n,) True to rotate 'iloc' around the parent ("parent" pivot)
+#   inherit : (n,) True to inherit the parent rotation
+#
+# and the evaluated values, written by 'evaluate':
+#
+#   loc, rot  : (n, 3) location, (n, 4) rotation of the node
+#   ploc, prot: the same for its parent (origin and identity for roots)
+#
+# The topology (children, evaluation order, levels) is fixed: a new tree
+# needs a new 'Nodes'. The parameters are plain attributes, replaced whenever
+# the caller has new values.
+
+
+class Nodes:
+    def __init__(self, parents):
+        n = len(parents)
+        self.parents = list(parents)
+        # parent index -> child indices (key -1 holds the roots)
+        self.children = {}
+        for i, p in enumerate(self.parents):
+            self.children.setdefault(p, []).append(i)
+        # evaluation order: breadth-first from the roots, so every parent comes
+        # before its children (the list grows while it is being traversed)
+        self.order = list(self.children.get(-1, ()))
+        for i in self.order:
+            self.order.extend(self.children.get(i, ()))
+        # nodes in parent loops (not reachable from a root) are evaluated as
+        # roots, after all the others
+        self.looped = sorted(set(range(n)).difference(self.order))
+        for i in self.looped:
+            self.parents[i] = -1
+            self.order.append(i)
+        self.parents_np = np.array(self.parents, dtype=np.int64)
+        self.iloc = np.zeros((n, 3))
+        self.rotang = np.zeros((n, 3))
+        self.pivot = np.zeros(n, dtype=bool)
+        self.inherit = np.ones(n, dtype=bool)
+        self.loc = np.zeros((n, 3))
+        self.rot = np.tile(QUAT_IDENTITY, (n, 1))
+        self.ploc = np.zeros((n, 3))
+        self.prot = np.tile(QUAT_IDENTITY, (n, 1))
+
+    def __len__(self):
+        return len(self.parents)
+
+    @cached_property
+    def levels(self):
+        # node indices grouped by tree depth (roots first)
+        return tree_levels(self.order, self.parents)
+
+    def subtree(self, idx):
+        # node 'idx' followed by all nodes below it, parents before children
+        order = [idx]
+        for i in order:
+            order.extend(self.children.get(i, ()))
+        return order
+
+    def descendants(self, idx):
+        # set of indices of all nodes below node 'idx'
+        return set(self.subtree(idx)[1:])
+
+    def evaluate(self, order=None):
+        # update loc/rot/ploc/prot of the nodes in 'order' (a subtree, parents
+        # first), or of all nodes; returns the indices of the updated nodes
+        if order is None:
+            levels = self.levels
+            ids = np.arange(len(self))
+            seed = None
+        else:
+            levels = tree_levels(order, self.parents)
+            ids = np.array(order, dtype=np.int64)
+            seed = (self.loc, self.rot, self.ploc, self.prot)
+        # deep trees: log2(depth) batches instead of one per level
+        if len(levels) > JUMP_LEVELS:
+            func, arg = evaluate_jumps, self.order if order is None else order
+        else:
+            func, arg = evaluate_levels, levels
+        self.loc, self.rot, self.ploc, self.prot = func(
+            arg,
+            self.parents_np,
+            self.iloc,
+            self.rotang,
+            self.pivot,
+            self.inherit,
+            seed,
+        )
+        return ids
+
+    def animate(self, val):
+        # set 'rotang' to the demo animation at 'val' (see 'anim_rotang')
+        self.rotang = anim_rotang(self.rotang, self.iloc[:, 2] != 0, val)
+        return self.rotang
+
+
+def tree_levels(order, parents):
+    # call from: 'Nodes.levels', 'Nodes.evaluate'
+
+    # 'order' lists parents before children: the depth of each item (relative
+    # to the first one) is known by the time it is reached
+    if not order:
+        return []
+    depth = {order[0]: 0}
+    for i in order[1:]:
+        depth[i] = depth.get(parents[i], -1) + 1
+    ids = np.array(order, dtype=np.int64)
+    ids = ids[np.argsort([depth[i] for i in order], kind="stable")]
+    bounds = np.flatnonzero(np.diff([depth[i] for i in ids])) + 1
+    return np.split(ids, bounds)
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------- ANIMATION ------------------------------------
+
+
+def frame_value(frame):
+    # animation value of a scene frame
+
+    return radians((frame - 1) * 3)
+
+
+def anim_rotang(rotang, tilt, val):
+    # call from: 'Nodes.animate', 'scene_update_frames'
+
+    # the animation turns each item around Y ('tilt': iloc.z != 0) or Z by an
+    # angle proportional to its index; the other angles keep their values
+    if not val:
+        return np.zeros_like(rotang)
+    rotang = rotang.copy()
+    ang = np.arange(1, len(rotang) + 1) * val
+    rotang[tilt, 1] = ang[tilt]
+    rotang[~tilt, 2] = ang[~tilt]
+    return rotang
+
+
+def held_rotang(rotang, tilt):
+    # call from: 'scene_update_frames', 'bake_key'
+
+    # the angles 'anim_rotang' keeps (the animated one of each item set to 0)
+    held = rotang.copy()
+    held[tilt, 1] = 0
+    held[~tilt, 2] = 0
+    return held
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------ QUATERNIONS -----------------------------------
+
+# Vectorized equivalents of the mathutils calls of "enum_ex3b". Quaternions are
+# (w, x, y, z) rows, as in mathutils; the formulas follow Blender's C math
+# library, so results match the mathutils path within float precision.
+
+QUAT_IDENTITY = np.array((1.0, 0.0, 0.0, 0.0))
+
+
+def quat_from_euler(eul):
+    # (n, 3) XYZ euler angles -> (n, 4) quaternions ('Euler.to_quaternion')
+    c = np.cos(eul * 0.5)
+    s = np.sin(eul * 0.5)
+    ci, cj, ch = c.T
+    si, sj, sh = s.T
+    cc, cs, sc, ss = ci * ch, ci * sh, si * ch, si * sh
+    return np.stack(
+        (cj * cc + sj * ss, cj * sc - sj * cs, cj * ss + sj * cc, cj * cs - sj * sc),
+        axis=-1,
+    )
+
+
+def quat_mul(a, b):
+    # row-wise 'Quaternion @ Quaternion'
+    aw, ax, ay, az = a.T
+    bw, bx, by, bz = b.T
+    return np.stack(
+        (
+            aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by + ay * bw + az * bx - ax * bz,
+            aw * bz + az * bw + ax * by - ay * bx,
+        ),
+        axis=-1,
+    )
+
+
+def quat_rotate(q, v):
+    # row-wise 'Quaternion @ Vector' (unit quaternions)
+    u = q[:, 1:]
+    t = 2.0 * np.cross(u, v)
+    return v + q[:, :1] * t + np.cross(u, t)
+
+
+def quat_from_y(vec):
+    # row-wise 'Vector((0, 1, 0)).rotation_difference(vec)'
+    length = np.linalg.norm(vec, axis=1)
+    d = vec / np.where(length > 0, length, 1)[:, None]
+    # rotation axis: (0, 1, 0) x d = (dz, 0, -dx)
+    s = np.hypot(d[:, 0], d[:, 2])
+    ok = s > 1.1920929e-07
+    half = 0.5 * np.arccos(np.clip(d[:, 1], -1, 1))
+    f = np.sin(half) / np.where(ok, s, 1)
+    q = np.stack((np.cos(half), d[:, 2] * f, np.zeros(len(d)), -d[:, 0] * f), axis=-1)
+    # parallel: no rotation / opposite or zero length: half turn, as mathutils
+    q[~ok & (d[:, 1] > 0)] = (1, 0, 0, 0)
+    q[~ok & (d[:, 1] <= 0)] = (0, 0.5**0.5, 0, 0.5**0.5)
+    return q
+
+
+def quat_to_euler(q):
+    # row-wise 'Quaternion.to_euler()' (XYZ), via the rotation matrix
+    w, x, y, z = q.T
+    r00 = 1 - 2 * (y * y + z * z)
+    r10 = 2 * (x * y + w * z)
+    r20 = 2 * (x * z - w * y)
+    cy = np.hypot(r00, r10)
+    ok = cy > 16 * 1.1920929e-07
+    # gimbal lock: no z rotation
+    ex = np.where(
+        ok,
+        np.arctan2(2 * (y * z + w * x), 1 - 2 * (x * x + y * y)),
+        np.arctan2(-2 * (y * z - w * x), 1 - 2 * (x * x + z * z)),
+    )
+    ez = np.where(ok, np.arctan2(r10, r00), 0)
+    return np.stack((ex, np.arctan2(-r20, cy), ez), axis=-1)
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------------- EVALUATION -----------------------------------
+
+# Two ways to evaluate the same recurrence, parents before children:
+#
+#   rot[i] = rot[p] @ q[i]      (identity instead of rot[p] if not inherited)
+#   loc[i] = loc[p] + vec[i]    (vec[i]: iloc, rotated by rot[i] on a pivot)
+#
+#   evaluate_levels: one batch per tree level. Cheap on wide, shallow trees,
+#                    but a level of a deep tree holds a few items only, so a
+#                    chain of n items costs n batches
+#   evaluate_jumps : pointer jumping. Every item keeps a link to an ancestor
+#                    and the product (rotations) or sum (offsets) of the items
+#                    between; each step folds in the ancestor's partial value
+#                    and doubles the link length, so any tree takes
+#                    log2(depth) batches over all its items
+#
+# 'Nodes.evaluate' uses the levels up to JUMP_LEVELS levels, the jumps above.
+
+JUMP_LEVELS = 24
+
+
+def evaluate_levels(levels, parents, iloc, rotang, pivot, inherit, seed=None):
+    # call from: 'Nodes.evaluate'
+
+    # evaluates the items in 'levels' one tree level at a time: every item in
+    # a level only needs the (already computed) loc/rot of the level above.
+    # 'seed' (loc, rot, ploc, prot) holds the current values of the items
+    # that are not in 'levels' (subtree update)
+    n = len(parents)
+    if seed is None:
+        loc = np.zeros((n, 3))
+        rot = np.zeros((n, 4))
+        ploc = np.zeros((n, 3))
+        prot = np.zeros((n, 4))
+    else:
+        loc, rot, ploc, prot = (np.array(v, dtype=np.float64) for v in seed)
+    q = quat_from_euler(np.asarray(rotang, dtype=np.float64))
+    for ids in levels:
+        pids = parents[ids]
+        has = pids > -1
+        # roots: index -1 picks the last row, masked out by 'has'
+        ploc[ids] = np.where(has[:, None], loc[pids], 0)
+        prot[ids] = np.where((has & inherit[ids])[:, None], rot[pids], QUAT_IDENTITY)
+        rot[ids] = quat_mul(prot[ids], q[ids])
+        vec = np.where(pivot[ids, None], quat_rotate(rot[ids], iloc[ids]), iloc[ids])
+        loc[ids] = ploc[ids] + vec
+    return loc, rot, ploc, prot
+
+
+def evaluate_jumps(order, parents, iloc, rotang, pivot, inherit, seed=None):
+    # call from: 'Nodes.evaluate'
+
+    # evaluates the items in 'order' by pointer jumping (see above); 'seed' as
+    # in 'evaluate_levels'
+    n = len(parents)
+    if seed is None:
+        loc = np.zeros((n, 3))
+        rot = np.zeros((n, 4))
+        ploc = np.zeros((n, 3))
+        prot = np.zeros((n, 4))
+    else:
+        loc, rot, ploc, prot = (np.array(v, dtype=np.float64) for v in seed)
+    ids = np.asarray(order, dtype=np.int64)
+    # item index -> position in 'order' (-1: not evaluated here)
+    pos = np.full(n, -1, dtype=np.int64)
+    pos[ids] = np.arange(len(ids))
+    pids = parents[ids]
+    has = pids > -1
+    # parents evaluated here, and parents that keep their (seed) values
+    inside = has & (pos[pids] > -1)
+    outside = has & ~inside
+    inh = inherit[ids]
+    # rotations: products along the inherited links
+    r = quat_from_euler(np.asarray(rotang, dtype=np.float64)[ids])
+    fixed = outside & inh
+    r[fixed] = quat_mul(rot[pids[fixed]], r[fixed])
+    rot[ids] = jumps(r, np.where(inside & inh, pos[pids], -1), quat_mul)
+    prot[ids] = np.where((has & inh)[:, None], rot[pids], QUAT_IDENTITY)
+    # locations: sums along all the links
+    vec = np.where(pivot[ids, None], quat_rotate(rot[ids], iloc[ids]), iloc[ids])
+    vec[outside] += loc[pids[outside]]
+    loc[ids] = jumps(vec, np.where(inside, pos[pids], -1), np.add)
+    ploc[ids] = np.where(has[:, None], loc[pids], 0)
+    return loc, rot, ploc, prot
+
+
+def jumps(vals, links, op):
+    # call from: 'evaluate_jumps'
+
+    # vals[i] = op(vals[links[i]], vals[i]) up the links (-1: none), all items
+    # at once: the right sides are computed before anything is assigned
+    vals = vals.copy()
+    links = links.copy()
+    act = np.flatnonzero(links > -1)
+    while len(act):
+        up = links[act]
+        vals[act] = op(vals[up], vals[act])
+        links[act] = links[up]
+        act = act[links[act] > -1]
+    return vals
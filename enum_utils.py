@@ -0,0 +1,307 @@
+##############################################################################
+#                                                                            #
+#   Three examples of using the Enumerator Property in Blender 3.3           #
+#                          Pan Thistle, 2023                                 #
+#                                                                            #
+#   This program is free software: you can redistribute it and/or modify     #
+#   it under the terms of the GNU General Public License as published by     #
+#   the Free Software Foundation, either version 3 of the License, or        #
+#   (at your option) any later version.                                      #
+#                                                                            #
+#   This program is distributed in the hope that it will be useful,          #
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of           #
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the            #
+#   GNU General Public License for more details.                             #
+#                                                                            #
+#   You should have received a copy of the GNU General Public License        #
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.   #
+#                                                                            #
+##############################################################################
+
+
+# Shared helpers for the enum examples. Keep this file next to them: the
+# examples add their own folder to 'sys.path' to import it.
+
+
+from array import array
+from collections import OrderedDict
+from functools import wraps
+from itertools import product
+
+
+# ------------------------------------------------------------------------------
+#
+# ------------------------- CONSTRAINED ENUM GROUP -----------------------------
+
+# A group of enum properties (on one PropertyGroup) whose values must not
+# clash. Everything the callbacks need is computed once, when the group is
+# created (module import, before registration):
+#
+#   items  : for each property and each combination of the other values,
+#            the tuple of valid items ('items' callback)
+#   resolve: for each property and each combination of the other values,
+#            the value actually stored for each requested one: the requested
+#            value if valid, else the next valid one ('set' callback)
+#
+# so each callback is one tuple-key lookup. The tables grow with the product
+# of the item counts of the other properties: a group is meant to be small
+# (e.g. a track/up pair), a panel with many pickers uses one group each.
+#
+# Items get a fixed number (their position in the full list), so a stored
+# value keeps its meaning whatever subset of items is shown.
+
+
+class EnumGroup:
+    def __init__(self, props, clash):
+        # props: ((name, items, default index), ...), items as in EnumProperty
+        # clash(name_a, index_a, name_b, index_b) -> True if the values clash
+        self.names = tuple(p[0] for p in props)
+        self.defaults = {name: default for name, items, default in props}
+        self.all_items = {
+            name: tuple((*item[:3], i) for i, item in enumerate(items))
+            for name, items, default in props
+        }
+        # name -> names of the other properties (the table key order)
+        self.others = {
+            name: tuple(n for n in self.names if n != name) for name in self.names
+        }
+        self.items_table = {}
+        self.resolve_table = {}
+        for name in self.names:
+            items = self.all_items[name]
+            others = self.others[name]
+            ranges = [range(len(self.all_items[n])) for n in others]
+            self.items_table[name] = tab_items = {}
+            self.resolve_table[name] = tab_resolve = {}
+            for key in product(*ranges):
+                valid = tuple(
+                    i
+                    for i in range(len(items))
+                    if not any(clash(name, i, n, v) for n, v in zip(others, key))
+                )
+                tab_items[key] = tuple(items[i] for i in valid)
+                tab_resolve[key] = tuple(
+                    self.next_valid(i, valid, len(items)) for i in range(len(items))
+                )
+
+    @staticmethod
+    def next_valid(i, valid, size):
+        # 'i' if valid, else the first valid value after it (wrapping around)
+        for k in range(size):
+            j = (i + k) % size
+            if j in valid:
+                return j
+        # nothing is valid: keep the value
+        return i
+
+    def key(self, pg, name):
+        return tuple(pg.get(n, self.defaults[n]) for n in self.others[name])
+
+    # ---- callback factories
+
+    def items(self, name):
+        # 'items' callback: the valid items of 'name'
+        table = self.items_table[name]
+
+        def valid_items(pg, context):
+            return table[self.key(pg, name)]
+
+        return valid_items
+
+    def getter(self, name):
+        # 'get' callback: the stored index
+        default = self.defaults[name]
+
+        def get_value(pg):
+            return pg.get(name, default)
+
+        return get_value
+
+    def setter(self, name):
+        # 'set' callback: store the value, moved to the next valid one on a clash
+        table = self.resolve_table[name]
+
+        def set_value(pg, value):
+            pg[name] = table[self.key(pg, name)][value]
+
+        return set_value
+
+
+# ------------------------------------------------------------------------------
+#
+# ----------------------------- EXCLUSIVE SLOTS --------------------------------
+
+# Any number of enum properties (get/set) that each claim a different item
+# ("slot") of one shared item list. The occupied slots are kept as bits of an
+# integer property on the PropertyGroup, so a set is a few bit operations
+# whatever the number of properties:
+#
+#   taken = mask without the property's own slot
+#   free  = ~taken (within the slot count)
+#   clash : free bit 'value' is 0
+#   next free slot at or after 'value': the lowest bit of free & -(1 << value),
+#   or of 'free' itself when there is none above (wrap around)
+#
+# The mask is an IntProperty (32-bit signed), so a group has at most 31 slots.
+
+
+class SlotGroup:
+    def __init__(self, names, items, mask="slot_mask"):
+        # names: the enum properties, items: the slots (as in EnumProperty)
+        # mask: name of the IntProperty that holds the occupied slots
+        if len(items) > 31:
+            raise ValueError("SlotGroup: at most 31 slots")
+        if len(names) > len(items):
+            raise ValueError("SlotGroup: more properties than slots")
+        self.mask = mask
+        self.items = tuple((*item[:3], i) for i, item in enumerate(items))
+        self.full = (1 << len(items)) - 1
+        # property i starts in slot i
+        self.defaults = {name: i for i, name in enumerate(names)}
+        self.initial_mask = (1 << len(names)) - 1
+
+    def mask_get(self, pg):
+        return pg.get(self.mask, self.initial_mask)
+
+    def is_free(self, pg, slot):
+        return not self.mask_get(pg) >> slot & 1
+
+    def claim(self, pg, name, value):
+        # move property 'name' to slot 'value', or to the next free one
+        cur = pg.get(name, self.defaults[name])
+        taken = self.mask_get(pg) & ~(1 << cur)
+        free = self.full & ~taken
+        if not free >> value & 1:
+            above = free & -(1 << value)
+            pick = above or free
+            value = (pick & -pick).bit_length() - 1
+        pg[self.mask] = taken | (1 << value)
+        pg[name] = value
+
+    # ---- callback factories
+
+    def getter(self, name):
+        # 'get' callback: the claimed slot
+        default = self.defaults[name]
+
+        def get_slot(pg):
+            return pg.get(name, default)
+
+        return get_slot
+
+    def setter(self, name):
+        # 'set' callback: claim the slot (or the next free one)
+
+        def set_slot(pg, value):
+            self.claim(pg, name, value)
+
+        return set_slot
+
+
+# ------------------------------------------------------------------------------
+#
+# ---------------------------- ENUM ITEMS CACHE --------------------------------
+
+# Decorator for dynamic enum 'items' callbacks. Blender calls them on every
+# redraw (and for every hover of an open dropdown), and it requires the
+# returned strings to stay alive while they are shown. The decorated callback
+# is only run when 'key(self, context)' returns a value it has not seen
+# recently; its result is stored as a tuple and the same tuple is returned
+# for the same key. At most 'maxsize' results are kept, least recently used
+# first out.
+#
+#   @enum_cache(key=lambda self, context: self.ctrl)
+#   def optenum_items(self, context):
+#       ...
+#
+# The wrapper is a plain function (Blender does not accept other callables
+# as 'items'), with 'cache_info()' (hits, misses, size) and 'cache_clear()'.
+
+
+def enum_cache(key, maxsize=64):
+    def decorator(func):
+        results = OrderedDict()
+        stats = {"hits": 0, "misses": 0}
+
+        @wraps(func)
+        def items(self, context):
+            k = key(self, context)
+            res = results.get(k)
+            if res is not None:
+                results.move_to_end(k)
+                stats["hits"] += 1
+                return res
+            stats["misses"] += 1
+            res = results[k] = tuple(func(self, context))
+            if len(results) > maxsize:
+                results.popitem(last=False)
+            return res
+
+        def cache_info():
+            return {**stats, "size": len(results), "maxsize": maxsize}
+
+        def cache_clear():
+            results.clear()
+            stats["hits"] = stats["misses"] = 0
+
+        items.cache_info = cache_info
+        items.cache_clear = cache_clear
+        return items
+
+    return decorator
+
+
+# ------------------------------------------------------------------------------
+#
+# ---------------------------- INTEGER ITEM IDS --------------------------------
+
+# Tree items (user-list items with a parent link) are identified by an integer
+# 'uid' (> 0) and point to their parent with 'pid' (0: no parent). The ids are
+# issued by a counter IntProperty on the PropertyGroup that owns the list, so
+# an id is never reused in a file, and all of them are read with two
+# 'foreach_get' calls instead of one string compare per link.
+#
+# Files saved by earlier versions have UUID strings in 'uid'/'pid':
+# 'uids_migrate' converts them, keeping the parent links. It reads the raw
+# (ID property) values, so it must run before RNA reads the items.
+
+
+def uid_new(props, counter="uid_counter"):
+    # the next id of the list owned by 'props'
+    uid = getattr(props, counter) + 1
+    setattr(props, counter, uid)
+    return uid
+
+
+def ids_read(subs):
+    # (uids, pids) of all items of 'subs', as lists
+    uids = array("i", bytes(4 * len(subs)))
+    pids = array("i", bytes(4 * len(subs)))
+    subs.foreach_get("uid", uids)
+    subs.foreach_get("pid", pids)
+    return uids.tolist(), pids.tolist()
+
+
+def uids_migrate(props, counter="uid_counter"):
+    # give integer ids to the items of 'props.subs' that have string ones;
+    # returns the number of converted items
+    subs = props.subs
+    old = [(item.get("uid"), item.get("pid")) for item in subs]
+    if not any(isinstance(v, str) for pair in old for v in pair):
+        return 0
+    # the counter must stay above the integer ids already in use
+    used = [uid for uid, pid in old if isinstance(uid, int)]
+    setattr(props, counter, max([getattr(props, counter)] + used))
+    # UUID string -> new id
+    new = {}
+    for item, (uid, pid) in zip(subs, old):
+        if isinstance(uid, str):
+            del item["uid"]
+            item.uid = new[uid] = uid_new(props, counter)
+    for item, (uid, pid) in zip(subs, old):
+        if isinstance(pid, str):
+            del item["pid"]
+            if pid and pid not in new:
+                print(f'{item.name} parent id: "{pid}" not found!')
+            item.pid = new.get(pid, 0)
+    return len(new)